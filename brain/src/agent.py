@@ -3,6 +3,7 @@ import logging
 import time
 from dataclasses import dataclass, field
 from datetime import datetime
+from functools import cached_property
 from typing import Any, List
 
 # from .config import settings # Config not fully ported yet, using defaults or env
@@ -27,6 +28,20 @@ class IncidentReport:
     verified: bool = False
     created_at: datetime = field(default_factory=datetime.utcnow)
     
+    # Memoized UI representation; bump _format_version whenever the report changes
+    _format_version: int = field(default=0, init=False, repr=False, compare=False)
+    _formatted_cache: dict | None = field(default=None, init=False, repr=False, compare=False)
+    _format_cached_version: int = field(default=-1, init=False, repr=False, compare=False)
+    
+    @cached_property
+    def created_iso(self) -> str | None:
+        """UTC ISO-8601 creation time; created_at never changes once set."""
+        return self.created_at.isoformat() + "Z" if self.created_at else None
+    
+    def mark_updated(self):
+        """Invalidate cached representations after a mutation (e.g. new action_result)."""
+        self._format_version += 1
+    
     def to_dict(self) -> dict:
         return {
             "incident": self.incident.to_dict(),
@@ -70,16 +85,37 @@ class IncidentResponseAgent:
         # State
         self._running = False
         self._incidents: list[IncidentReport] = []
+        self._incidents_by_id: dict[str, IncidentReport] = {}
+        self._pending_ids: set[str] = set()
         self._pending_approvals: list[IncidentReport] = []
     
     @property
     def incidents(self) -> list[IncidentReport]:
         return self._incidents
     
+    @property
+    def incidents_by_id(self) -> dict[str, IncidentReport]:
+        return self._incidents_by_id
+    
     @property
     def pending_approvals(self) -> list[IncidentReport]:
         return self._pending_approvals
     
+    @property
+    def pending_ids(self) -> set[str]:
+        """IDs of reports that require approval and have not been executed yet."""
+        return self._pending_ids
+    
+    def update_pending(self, report: IncidentReport):
+        """Re-evaluate whether a report is awaiting approval after a state change."""
+        result = report.action_result
+        if report.decision and report.decision.requires_approval and (
+            not result or result.status.value in ("pending", "executing")
+        ):
+            self._pending_ids.add(report.incident.id)
+        else:
+            self._pending_ids.discard(report.incident.id)
+    
     async def run_detection_cycle(self, namespace: str | None = None) -> list[IncidentCandidate]:
         """Run a single detection cycle across all detectors."""
         all_candidates = []
@@ -125,6 +161,8 @@ class IncidentResponseAgent:
             report.action_result = result
         
         self._incidents.append(report)
+        self._incidents_by_id[incident.id] = report
+        self.update_pending(report)
         return report
 
     async def run_forever(
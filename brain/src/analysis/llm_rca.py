@@ -12,7 +12,7 @@ import hashlib
 import json
 import logging
 import time
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Any
 
 import httpx
@@ -39,17 +39,20 @@ class RCAResult:
     recommended_action: str
     rollback_guidance: str
     reasoning: str
+    _cached_dict: dict | None = field(default=None, init=False, repr=False, compare=False)
     
     def to_dict(self) -> dict:
-        return {
-            "root_cause": self.root_cause,
-            "confidence": self.confidence,
-            "evidence": self.evidence,
-            "contributing_factors": self.contributing_factors,
-            "recommended_action": self.recommended_action,
-            "rollback_guidance": self.rollback_guidance,
-            "reasoning": self.reasoning
-        }
+        if self._cached_dict is None:
+            self._cached_dict = {
+                "root_cause": self.root_cause,
+                "confidence": self.confidence,
+                "evidence": self.evidence,
+                "contributing_factors": self.contributing_factors,
+                "recommended_action": self.recommended_action,
+                "rollback_guidance": self.rollback_guidance,
+                "reasoning": self.reasoning
+            }
+        return self._cached_dict
 
 
 # ============== RULE-BASED FALLBACK PATTERNS ==============
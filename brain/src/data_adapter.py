@@ -1,3 +1,4 @@
+import asyncio
 import logging
 import json
 import time
@@ -24,18 +25,18 @@ class DataSource:
         
         # Map PromQL metric names to actual stored metric names
         if "container_memory_working_set_bytes" in query:
-            return self._get_metrics_by_pattern([
+            return await asyncio.to_thread(self._get_metrics_by_pattern, [
                 "cilium_process_resident_memory_bytes",
                 "process_resident_memory_bytes"
             ])
         elif "container_cpu_usage_seconds_total" in query:
-            return self._get_metrics_by_pattern([
+            return await asyncio.to_thread(self._get_metrics_by_pattern, [
                 "cilium_process_cpu_seconds_total",
                 "process_cpu_seconds_total"
             ])
         elif "kube_pod_container_status_restarts_total" in query:
             # Check for restart-related metrics or high error counts
-            return self._get_restart_metrics()
+            return await asyncio.to_thread(self._get_restart_metrics)
         
         return {"data": {"result": []}}
 
@@ -46,9 +47,9 @@ class DataSource:
         logger.info(f"PromQL range query: {query}")
         
         if "container_memory_working_set_bytes" in query:
-            return self._get_metrics_range("cilium_process_resident_memory_bytes")
+            return await asyncio.to_thread(self._get_metrics_range, "cilium_process_resident_memory_bytes")
         elif "container_cpu_usage_seconds_total" in query:
-            return self._get_metrics_range("cilium_process_cpu_seconds_total")
+            return await asyncio.to_thread(self._get_metrics_range, "cilium_process_cpu_seconds_total")
             
         return {"data": {"result": []}}
 
@@ -56,6 +57,10 @@ class DataSource:
         """
         Fetch recent logs for a pod from the DB.
         """
+        return await asyncio.to_thread(self._tail_logs, pod, namespace, lines)
+
+    def _tail_logs(self, pod: str, namespace: str, lines: int) -> Dict[str, Any]:
+        """Blocking log query; run off the event loop."""
         try:
             with self.db.get_connection() as conn:
                 cursor = conn.cursor()
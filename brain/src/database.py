@@ -3,19 +3,27 @@ import logging
 import json
 import hashlib
 from contextlib import contextmanager
+from typing import Iterator
 
 logger = logging.getLogger(__name__)
 
 DB_NAME = "brain.db"
 
 class Database:
+    # Database files whose schema has already been set up in this process
+    _initialized: set[str] = set()
+
     def __init__(self, db_name=DB_NAME):
         self.db_name = db_name
-        self.init_db()
+        if db_name not in Database._initialized:
+            self.init_db()
+            Database._initialized.add(db_name)
 
     @contextmanager
-    def get_connection(self):
-        conn = sqlite3.connect(self.db_name)
+    def get_connection(self, check_same_thread: bool = True):
+        conn = sqlite3.connect(self.db_name, check_same_thread=check_same_thread)
+        # WAL keeps fsyncs off the commit path; NORMAL is durable across app crashes
+        conn.execute("PRAGMA synchronous=NORMAL")
         try:
             yield conn
         finally:
@@ -47,6 +55,8 @@ class Database:
         """
         with self.get_connection() as conn:
             cursor = conn.cursor()
+            # journal_mode is persistent, so this only needs to happen once per file
+            cursor.execute("PRAGMA journal_mode=WAL")
             cursor.execute(create_metrics_table)
             cursor.execute(create_logs_table)
             
@@ -83,6 +93,23 @@ class Database:
         except Exception as e:
             logger.error(f"Failed to insert metric: {e}")
 
+    def insert_metrics_batch(self, rows: list[tuple]):
+        """Insert (timestamp, name, labels, value) rows in a single transaction."""
+        if not rows:
+            return
+        try:
+            with self.get_connection() as conn:
+                conn.executemany(
+                    "INSERT INTO metrics (timestamp, name, labels, value) VALUES (?, ?, ?, ?)",
+                    [(ts, name, json.dumps(labels), value) for ts, name, labels, value in rows]
+                )
+                conn.commit()
+        except Exception as e:
+            # The transaction was rolled back; retry row by row so one bad row only loses itself
+            logger.error(f"Failed to insert metric batch, retrying row by row: {e}")
+            for row in rows:
+                self.insert_metric(*row)
+
     def insert_log(self, timestamp, labels, line):
         """Insert a log entry into the database with deduplication."""
         try:
@@ -107,6 +134,35 @@ class Database:
         except Exception as e:
             logger.error(f"Failed to insert log: {e}")
 
+    def insert_logs_batch(self, rows: list[tuple]):
+        """Insert (timestamp, labels, line) rows with deduplication in a single transaction."""
+        if not rows:
+            return
+        try:
+            params = []
+            for timestamp, labels, line in rows:
+                labels_str = json.dumps(labels, sort_keys=True)
+                content_hash = hashlib.sha256((labels_str + line).encode('utf-8')).hexdigest()
+                params.append((timestamp, labels_str, line, content_hash))
+
+            with self.get_connection() as conn:
+                conn.executemany(
+                    """
+                    INSERT INTO logs (timestamp, labels, line, hash, count) 
+                    VALUES (?, ?, ?, ?, 1)
+                    ON CONFLICT(hash) DO UPDATE SET 
+                        timestamp = excluded.timestamp,
+                        count = count + 1
+                    """,
+                    params
+                )
+                conn.commit()
+        except Exception as e:
+            # The transaction was rolled back; retry row by row so one bad row only loses itself
+            logger.error(f"Failed to insert log batch, retrying row by row: {e}")
+            for row in rows:
+                self.insert_log(*row)
+
     def _parse_labels(self, labels_raw: str | None) -> dict:
         """Parse stored labels into a dictionary."""
         if not labels_raw:
@@ -149,15 +205,22 @@ class Database:
 
     def get_logs(self, namespace: str | None = None, pod: str | None = None, limit: int = 100) -> list[dict]:
         """Get logs with optional filters."""
+        return list(self.iter_logs(namespace=namespace, pod=pod, limit=limit))
+
+    def iter_logs(self, namespace: str | None = None, pod: str | None = None, limit: int = 100) -> Iterator[dict]:
+        """
+        Yield logs with optional filters straight from the cursor.
+        
+        The connection may be advanced from different threads (e.g. by a
+        StreamingResponse), so it is opened without the same-thread check.
+        """
         try:
-            with self.get_connection() as conn:
+            with self.get_connection(check_same_thread=False) as conn:
                 cursor = conn.cursor()
                 query = "SELECT id, timestamp, labels, line, count FROM logs ORDER BY timestamp DESC LIMIT ?"
                 cursor.execute(query, (limit,))
-                rows = cursor.fetchall()
                 
-                logs = []
-                for row in rows:
+                for row in cursor:
                     labels_raw = row[2]
                     labels = self._parse_labels(labels_raw)
                     
@@ -181,19 +244,16 @@ class Database:
                     elif "debug" in line.lower():
                         level = "debug"
                     
-                    logs.append({
+                    yield {
                         "timestamp": self._ms_to_iso(row[1]),
                         "level": level,
                         "message": line,
                         "pod": log_pod,
                         "namespace": log_namespace,
                         "count": row[4] or 1
-                    })
-                
-                return logs
+                    }
         except Exception as e:
             logger.error(f"Failed to get logs: {e}")
-            return []
 
     def _ms_to_iso(self, timestamp_ms: int) -> str:
         """Convert millisecond timestamp to ISO format string."""
@@ -242,21 +302,45 @@ class Database:
         except Exception as e:
             logger.error(f"Failed to insert audit entry: {e}")
 
+    def insert_audit_batch(self, rows: list[tuple]):
+        """Insert (id, timestamp_ms, action, actor, target, details, result, metadata) rows in a single transaction."""
+        if not rows:
+            return
+        try:
+            self._init_audit_table()
+
+            params = [
+                (entry_id, timestamp, action, actor, target, details, result,
+                 json.dumps(metadata) if metadata else None)
+                for entry_id, timestamp, action, actor, target, details, result, metadata in rows
+            ]
+            with self.get_connection() as conn:
+                conn.executemany(
+                    """INSERT INTO audit_log (id, timestamp, action, actor, target, details, result, metadata)
+                       VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
+                    params
+                )
+                conn.commit()
+        except Exception as e:
+            logger.error(f"Failed to insert audit batch: {e}")
+
     def get_audit_log(self, limit: int = 100) -> list[dict]:
         """Get audit log entries."""
+        return list(self.iter_audit_log(limit))
+
+    def iter_audit_log(self, limit: int = 100) -> Iterator[dict]:
+        """Yield audit log entries straight from the cursor (see iter_logs)."""
         try:
             self._init_audit_table()
             
-            with self.get_connection() as conn:
+            with self.get_connection(check_same_thread=False) as conn:
                 cursor = conn.cursor()
                 cursor.execute(
                     "SELECT id, timestamp, action, actor, target, details, result, metadata FROM audit_log ORDER BY timestamp DESC LIMIT ?",
                     (limit,)
                 )
-                rows = cursor.fetchall()
                 
-                entries = []
-                for row in rows:
+                for row in cursor:
                     metadata = None
                     if row[7]:
                         try:
@@ -264,7 +348,7 @@ class Database:
                         except:
                             pass
                     
-                    entries.append({
+                    yield {
                         "id": row[0],
                         "timestamp": self._ms_to_iso(row[1]),
                         "action": row[2],
@@ -273,12 +357,9 @@ class Database:
                         "details": row[5],
                         "result": row[6],
                         "metadata": metadata
-                    })
-                
-                return entries
+                    }
         except Exception as e:
             logger.error(f"Failed to get audit log: {e}")
-            return []
 
     # ============== Issues ==============
     
@@ -321,15 +402,16 @@ class Database:
             logger.error(f"Failed to insert issue: {e}")
             return None
 
-    def get_issues(self) -> list[dict]:
-        """Get all issues."""
+    def get_issues(self, limit: int | None = None) -> list[dict]:
+        """Get issues, newest first, optionally capped at limit."""
         try:
             self._init_issues_table()
             
             with self.get_connection() as conn:
                 cursor = conn.cursor()
                 cursor.execute(
-                    "SELECT id, incident_id, status, created_at, updated_at, remediation_attempts, verified, verification_message FROM issues ORDER BY created_at DESC"
+                    "SELECT id, incident_id, status, created_at, updated_at, remediation_attempts, verified, verification_message FROM issues ORDER BY created_at DESC LIMIT ?",
+                    (limit if limit is not None else -1,)
                 )
                 rows = cursor.fetchall()
                 
@@ -358,6 +440,24 @@ class Database:
             logger.error(f"Failed to get issues: {e}")
             return []
 
+    def get_issue_status_counts(self) -> tuple[dict[str, int], int]:
+        """Count issues per known status, plus the total over every status, with one grouped query."""
+        counts = {"open": 0, "fixing": 0, "resolved": 0, "needs_attention": 0}
+        total = 0
+        try:
+            self._init_issues_table()
+            
+            with self.get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute("SELECT status, COUNT(*) FROM issues GROUP BY status")
+                for status, count in cursor:
+                    total += count
+                    if status in counts:
+                        counts[status] = count
+        except Exception as e:
+            logger.error(f"Failed to count issues: {e}")
+        return counts, total
+
     def get_issue(self, issue_id: str) -> dict | None:
         """Get a single issue by ID."""
         try:
@@ -4,6 +4,7 @@ Remediation Actions
 Defines and executes remediation actions via Gateway Agent.
 """
 
+import asyncio
 import logging
 from dataclasses import dataclass, field
 from datetime import datetime
@@ -24,7 +25,7 @@ class ActionStatus(str, Enum):
     VERIFIED = "verified"
 
 
-from ..tools.k8s_client import k8s_toolbox
+from ..tools.k8s_client import get_k8s_toolbox
 
 @dataclass
 class ActionResult:
@@ -37,9 +38,12 @@ class ActionResult:
     audit_id: str | None = None
     started_at: datetime = field(default_factory=datetime.utcnow)
     completed_at: datetime | None = None
+    _cached_dict: dict | None = field(default=None, init=False, repr=False, compare=False)
     
     def to_dict(self) -> dict:
-        return {
+        if self._cached_dict is not None:
+            return self._cached_dict
+        d = {
             "action": self.action,
             "status": self.status.value,
             "result": self.result,
@@ -48,13 +52,24 @@ class ActionResult:
             "started_at": self.started_at.isoformat(),
             "completed_at": self.completed_at.isoformat() if self.completed_at else None
         }
+        # The executor mutates results in flight; only freeze finished ones
+        if self.completed_at is not None:
+            self._cached_dict = d
+        return d
 
 
 class RemediationExecutor:
     """Executes remediation actions via Kubernetes Toolbox."""
     
     def __init__(self, toolbox=None):
-        self.toolbox = toolbox or k8s_toolbox
+        self._toolbox = toolbox
+    
+    @property
+    def toolbox(self):
+        """The injected toolbox, or the shared one resolved on first use."""
+        if self._toolbox is None:
+            self._toolbox = get_k8s_toolbox()
+        return self._toolbox
     
     async def execute(
         self,
@@ -88,7 +103,8 @@ class RemediationExecutor:
                 if incident.incident_type == "disk_full":
                      raise ValueError("Cannot restart node for disk_full")
 
-                response = self.toolbox.delete_pod(
+                response = await asyncio.to_thread(
+                    self.toolbox.delete_pod,
                     name=incident.source,
                     namespace=incident.namespace
                 )
@@ -96,7 +112,8 @@ class RemediationExecutor:
                 
             elif action == "rollout_restart":
                 deployment = self._extract_deployment_name(incident.source)
-                response = self.toolbox.rollout_restart(
+                response = await asyncio.to_thread(
+                    self.toolbox.rollout_restart,
                     deployment_name=deployment,
                     namespace=incident.namespace
                 )
@@ -105,7 +122,8 @@ class RemediationExecutor:
             elif action == "scale_deployment":
                 deployment = self._extract_deployment_name(incident.source)
                 # Simple logic: scale to 2 (should be adaptive in real world)
-                response = self.toolbox.scale_deployment(
+                response = await asyncio.to_thread(
+                    self.toolbox.scale_deployment,
                     name=deployment,
                     namespace=incident.namespace,
                     replicas=2 
@@ -9,7 +9,7 @@ Implements the decision logic:
 """
 
 import logging
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from enum import Enum
 from typing import Any
 
@@ -44,16 +44,19 @@ class Decision:
     reasoning: str
     requires_approval: bool = False
     auto_approved: bool = False
+    _cached_dict: dict | None = field(default=None, init=False, repr=False, compare=False)
     
     def to_dict(self) -> dict:
-        return {
-            "decision_type": self.decision_type.value,
-            "action": self.action,
-            "risk_level": self.risk_level.value,
-            "reasoning": self.reasoning,
-            "requires_approval": self.requires_approval,
-            "auto_approved": self.auto_approved
-        }
+        if self._cached_dict is None:
+            self._cached_dict = {
+                "decision_type": self.decision_type.value,
+                "action": self.action,
+                "risk_level": self.risk_level.value,
+                "reasoning": self.reasoning,
+                "requires_approval": self.requires_approval,
+                "auto_approved": self.auto_approved
+            }
+        return self._cached_dict
 
 
 class DecisionTree:
@@ -62,12 +62,11 @@ class BaseDetector(ABC):
         if not signals:
             return []
         
-        # Correlate into incident candidates
-        candidates = self.correlator.correlate(signals, self.incident_type)
-        
-        # Filter false positives - allow single signals with warning+ severity
-        filtered = self.correlator.filter_false_positives(
-            candidates, 
+        # Correlate into incident candidates, filtering false positives in the
+        # same pass - allow single signals with warning+ severity
+        filtered = self.correlator.correlate_and_filter(
+            signals,
+            self.incident_type,
             min_confidence=0.15,  # Lower threshold for demo
             min_signals=1
         )
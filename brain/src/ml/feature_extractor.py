@@ -120,7 +120,7 @@ class FeatureExtractor:
     def extract_metric_features(
         self,
         name: str,
-        values: list[float],
+        values: np.ndarray | list[float],
         pod: str,
         namespace: str
     ) -> MetricFeatures:
@@ -129,26 +129,23 @@ class FeatureExtractor:
         
         Args:
             name: Metric name
-            values: Time series values
+            values: Time series values (an ndarray is used without copying)
             pod: Pod name
             namespace: Namespace
         
         Returns:
             MetricFeatures object
         """
-        if not values:
+        arr = np.asarray(values, dtype=np.float64)
+        if arr.size == 0:
             return MetricFeatures(name=name, pod=pod, namespace=namespace)
         
-        arr = np.array(values)
-        
         # Statistical features
-        mean = float(np.mean(arr))
-        std = float(np.std(arr))
+        mean = float(arr.mean())
+        std = float(arr.std())
         
         # Percentiles
-        p50 = float(np.percentile(arr, 50))
-        p90 = float(np.percentile(arr, 90))
-        p99 = float(np.percentile(arr, 99))
+        p50, p90, p99 = (float(p) for p in np.percentile(arr, [50, 90, 99]))
         
         # Rate of change (linear regression slope)
         if len(arr) > 1:
@@ -170,7 +167,7 @@ class FeatureExtractor:
         # Spike detection
         if std > 0:
             spikes = np.abs(arr - mean) > 2 * std
-            spike_count = int(np.sum(spikes))
+            spike_count = int(spikes.sum())
         else:
             spike_count = 0
         
@@ -180,8 +177,8 @@ class FeatureExtractor:
             namespace=namespace,
             mean=mean,
             std=std,
-            min_val=float(np.min(arr)),
-            max_val=float(np.max(arr)),
+            min_val=float(arr.min()),
+            max_val=float(arr.max()),
             rate_of_change=rate_of_change,
             variance_change=variance_change,
             p50=p50,
@@ -7,6 +7,8 @@ Integrates ML anomaly detection with the existing detector framework.
 import logging
 from typing import Any
 
+import numpy as np
+
 from ..data_adapter import DataSource
 from ..signals.normalizer import Signal, SignalType, SignalSeverity, SignalNormalizer
 from ..signals.correlator import IncidentCandidate, SignalCorrelator
@@ -111,12 +113,14 @@ class MLAnomalyDetector(BaseDetector):
                 )
                 
                 if range_result.get("data", {}).get("result"):
-                    # Extract values and timestamps
-                    values = []
-                    timestamps = []
-                    for point in range_result["data"]["result"][0].get("values", []):
-                        timestamps.append(float(point[0]))
-                        values.append(float(point[1]))
+                    # Extract values and timestamps straight into arrays
+                    points = range_result["data"]["result"][0].get("values", [])
+                    timestamps = np.fromiter(
+                        (float(p[0]) for p in points), dtype=np.float64, count=len(points)
+                    )
+                    values = np.fromiter(
+                        (float(p[1]) for p in points), dtype=np.float64, count=len(points)
+                    )
                     
                     if len(values) >= 3:
                         # Extract features
@@ -149,7 +153,7 @@ class MLAnomalyDetector(BaseDetector):
                         # Check trend prediction
                         prediction = self.trend_predictor.predict(
                             metric_name="memory_usage_percent",
-                            values=[v / 1e9 for v in values],  # Convert to GB for readability
+                            values=values / 1e9,  # Convert to GB for readability
                             timestamps=timestamps,
                             source=pod,
                             namespace=ns
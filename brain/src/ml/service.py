@@ -8,16 +8,27 @@ Simple flow:
 """
 
 import logging
+import time
+from collections import deque
 from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Any
 
+import numpy as np
+
 from ..mcp_client import MCPClient
 from .feature_extractor import FeatureExtractor, MetricFeatures, LogFeatures
 from .anomaly_detector import CombinedAnomalyDetector, AnomalyResult
 
 logger = logging.getLogger(__name__)
 
+# Pod membership changes slowly; reuse the active-pod list between scans
+PODS_CACHE_TTL_SECONDS = 20
+
+# Tail sizes kept on an AnomalyContext for the LLM prompt
+MAX_CONTEXT_LOGS = 30
+MAX_CONTEXT_EVENTS = 10
+
 
 @dataclass
 class AnomalyContext:
@@ -34,8 +45,9 @@ class AnomalyContext:
     
     # Raw data for LLM analysis
     raw_metrics: dict = field(default_factory=dict)
-    raw_logs: list[str] = field(default_factory=list)
-    raw_events: list[dict] = field(default_factory=list)
+    # Bounded at write time: only the most recent entries are ever reported
+    raw_logs: deque[str] = field(default_factory=lambda: deque(maxlen=MAX_CONTEXT_LOGS))
+    raw_events: deque[dict] = field(default_factory=lambda: deque(maxlen=MAX_CONTEXT_EVENTS))
     
     # Feature summary
     metric_features: dict | None = None
@@ -58,7 +70,9 @@ class AnomalyContext:
         if self.raw_metrics:
             sections.append("## Metrics")
             for name, values in self.raw_metrics.items():
-                if isinstance(values, list):
+                if isinstance(values, np.ndarray):
+                    sections.append(f"- **{name}**: {values[-5:].tolist()}")
+                elif isinstance(values, list):
                     sections.append(f"- **{name}**: {values[-5:] if len(values) > 5 else values}")
                 else:
                     sections.append(f"- **{name}**: {values}")
@@ -73,7 +87,7 @@ class AnomalyContext:
         if self.raw_logs:
             sections.append("## Recent Logs")
             sections.append("```")
-            for log in self.raw_logs[-30:]:  # Last 30 logs
+            for log in self.raw_logs:  # Last 30 logs
                 sections.append(log[:200])  # Truncate long lines
             sections.append("```")
             sections.append("")
@@ -86,7 +100,7 @@ class AnomalyContext:
         
         if self.raw_events:
             sections.append("## Kubernetes Events")
-            for event in self.raw_events[-10:]:  # Last 10 events
+            for event in self.raw_events:  # Last 10 events
                 sections.append(f"- [{event.get('type', 'Unknown')}] {event.get('reason', 'Unknown')}: {event.get('message', '')[:100]}")
             sections.append("")
         
@@ -99,9 +113,12 @@ class AnomalyContext:
             "anomaly_score": self.anomaly_score,
             "anomaly_type": self.anomaly_type,
             "contributing_factors": self.contributing_factors,
-            "raw_metrics": self.raw_metrics,
-            "raw_logs": self.raw_logs[-30:],  # Limit for JSON
-            "raw_events": self.raw_events[-10:],
+            "raw_metrics": {
+                k: v.tolist() if isinstance(v, np.ndarray) else v
+                for k, v in self.raw_metrics.items()
+            },
+            "raw_logs": list(self.raw_logs),
+            "raw_events": list(self.raw_events),
             "metric_features": self.metric_features,
             "log_features": self.log_features,
             "detected_at": self.detected_at.isoformat()
@@ -123,6 +140,9 @@ class AnomalyDetectionService:
         
         # Threshold for reporting anomalies
         self.anomaly_threshold = 0.3
+        
+        # namespace -> (fetched_at monotonic, pods)
+        self._pods_cache: dict[str | None, tuple[float, list[dict]]] = {}
     
     async def scan_for_anomalies(
         self,
@@ -160,6 +180,10 @@ class AnomalyDetectionService:
         namespace: str | None
     ) -> list[dict]:
         """Get pods that have recent activity (restarts, high resource usage)."""
+        cached = self._pods_cache.get(namespace)
+        if cached and time.monotonic() - cached[0] < PODS_CACHE_TTL_SECONDS:
+            return cached[1]
+        
         pods = []
         
         # Pods with restarts
@@ -197,6 +221,7 @@ class AnomalyDetectionService:
         except Exception as e:
             logger.debug(f"Failed to get memory info: {e}")
         
+        self._pods_cache[namespace] = (time.monotonic(), pods)
         return pods
     
     async def _analyze_pod(
@@ -234,8 +259,10 @@ class AnomalyDetectionService:
                 step="30s"
             )
             if result.get("data", {}).get("result"):
-                values = [float(v[1]) for v in result["data"]["result"][0].get("values", [])]
-                raw_metrics["memory_history"] = values
+                points = result["data"]["result"][0].get("values", [])
+                raw_metrics["memory_history"] = np.fromiter(
+                    (float(v[1]) for v in points), dtype=np.float64, count=len(points)
+                )
         except Exception as e:
             logger.debug(f"Failed to get metrics for {pod}: {e}")
         
@@ -297,7 +324,8 @@ class AnomalyDetectionService:
                     is_anomaly=combined_score > 0.3,
                     anomaly_type="combined",
                     contributing_factors=anomaly_result.contributing_factors + log_anomaly.contributing_factors,
-                    timestamp=datetime.utcnow()
+                    # Same detection pass as log_anomaly; reuse its timestamp
+                    timestamp=log_anomaly.timestamp
                 )
             else:
                 anomaly_result = log_anomaly
@@ -333,6 +361,7 @@ class AnomalyDetectionService:
                     is_anomaly=event_score >= self.anomaly_threshold,
                     anomaly_type="event",
                     contributing_factors=event_factors,
+                    # Only reached when no metric/log result exists, so there is no timestamp to reuse
                     timestamp=datetime.utcnow()
                 )
         
@@ -348,8 +377,8 @@ class AnomalyDetectionService:
             anomaly_type=anomaly_result.anomaly_type,
             contributing_factors=anomaly_result.contributing_factors,
             raw_metrics=raw_metrics,
-            raw_logs=raw_logs,
-            raw_events=raw_events,
+            raw_logs=deque(raw_logs, maxlen=MAX_CONTEXT_LOGS),
+            raw_events=deque(raw_events, maxlen=MAX_CONTEXT_EVENTS),
             metric_features=asdict_safe(metric_features) if metric_features else None,
             log_features=asdict_safe(log_features) if log_features else None
         )
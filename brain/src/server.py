@@ -1,12 +1,14 @@
 import asyncio
+import contextlib
 import logging
-import snappy
+import cramjam
 from fastapi import FastAPI, Request, HTTPException, status, Query
-from fastapi.responses import Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import Response, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
-from pydantic import BaseModel
-from typing import Optional
+import msgspec
+from typing import Iterator, Optional
 from src.proto.generated import remote_pb2, logproto_pb2
 
 # Configure logging
@@ -17,12 +19,15 @@ logger = logging.getLogger(__name__)
 from dotenv import load_dotenv
 import boto3
 import os
-import json
+import orjson
 import uuid
 import queue
 import threading
 import time
+from array import array
 from datetime import datetime
+from enum import Enum
+from google.protobuf.internal import api_implementation
 from google.protobuf.json_format import MessageToDict
 from src.database import Database
 
@@ -45,6 +50,20 @@ s3_client = boto3.client('s3',
 # Queue and Database Setup
 data_queue = queue.Queue()
 
+# Per-thread protobuf messages reused across ingest requests
+_tls = threading.local()
+
+if api_implementation.Type() != "upb":
+    logger.warning(f"Protobuf is using the '{api_implementation.Type()}' backend; upb is much faster for ingest")
+
+def _reusable_message(attr: str, factory):
+    """Return this thread's cached protobuf message, creating it on first use."""
+    msg = getattr(_tls, attr, None)
+    if msg is None:
+        msg = factory()
+        setattr(_tls, attr, msg)
+    return msg
+
 db = Database()
 
 def _parse_loki_labels(label_str: str) -> dict:
@@ -65,35 +84,94 @@ def _parse_loki_labels(label_str: str) -> dict:
         labels[key.strip()] = value.strip().strip('"')
     return labels
 
+# Group commit: flush queued items every BATCH_MAX_WAIT_SECONDS or BATCH_MAX_ITEMS
+BATCH_MAX_ITEMS = 1000
+BATCH_MAX_WAIT_SECONDS = 0.1
+
+def _drain_batch() -> list:
+    """Block for one item, then collect more until the batch is full or the window closes."""
+    batch = [data_queue.get()]
+    deadline = time.monotonic() + BATCH_MAX_WAIT_SECONDS
+    while len(batch) < BATCH_MAX_ITEMS and batch[-1] is not None:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        try:
+            batch.append(data_queue.get(timeout=remaining))
+        except queue.Empty:
+            break
+    return batch
+
 def data_processor():
     """Worker thread to process data from the queue and write to the database."""
     logger.info("Data processor thread started.")
     while True:
+        batch = []
         try:
-            item = data_queue.get()
-            if item is None:
-                break
+            batch = _drain_batch()
+            stop = batch[-1] is None
             
-            data_type = item.get('type')
+            metric_rows = []
+            log_rows = []
+            for item in batch:
+                if item is None:
+                    continue
+                try:
+                    data_type = item.get('type')
+                    if data_type == 'metric':
+                        metric_rows.append((item['timestamp'], item['name'], item['labels'], item['value']))
+                    elif data_type == 'log':
+                        log_rows.append((item['timestamp'], item['labels'], item['line']))
+                except (KeyError, AttributeError) as e:
+                    # Drop only the malformed item, not the rest of the batch
+                    logger.error(f"Skipping malformed queue item: {e!r}")
             
-            if data_type == 'metric':
-                db.insert_metric(
-                    item['timestamp'],
-                    item['name'],
-                    item['labels'],
-                    item['value']
-                )
-            elif data_type == 'log':
-                db.insert_log(
-                    item['timestamp'],
-                    item['labels'],
-                    item['line']
-                )
+            db.insert_metrics_batch(metric_rows)
+            db.insert_logs_batch(log_rows)
             
-            data_queue.task_done()
+            if stop:
+                break
         except Exception as e:
-            logger.error(f"Error processing item from queue: {e}")
+            logger.error(f"Error processing batch from queue: {e}")
             time.sleep(1) # Prevent tight loop on error
+        finally:
+            for _ in batch:
+                data_queue.task_done()
+
+# Audit group commit: endpoints enqueue rows, one task writes them in batches
+AUDIT_BATCH_MAX_ITEMS = 128
+AUDIT_BATCH_MAX_WAIT_SECONDS = 0.05
+
+audit_queue: asyncio.Queue = asyncio.Queue()
+
+def _record_audit(action: str, actor: str, target: str, details: str, result: str, metadata: dict | None = None):
+    """Queue an audit entry for the audit writer; the timestamp is taken now."""
+    audit_queue.put_nowait((
+        f"audit-{uuid.uuid4()}", int(time.time() * 1000),
+        action, actor, target, details, result, metadata
+    ))
+
+async def audit_writer():
+    """Collect queued audit entries and insert them with one executemany per batch."""
+    logger.info("Audit writer started.")
+    loop = asyncio.get_running_loop()
+    stop = False
+    while not stop:
+        batch = [await audit_queue.get()]
+        deadline = loop.time() + AUDIT_BATCH_MAX_WAIT_SECONDS
+        with contextlib.suppress(asyncio.TimeoutError):
+            while len(batch) < AUDIT_BATCH_MAX_ITEMS and batch[-1] is not None:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                batch.append(await asyncio.wait_for(audit_queue.get(), remaining))
+        
+        stop = batch[-1] is None
+        rows = [row for row in batch if row is not None]
+        try:
+            await asyncio.to_thread(db.insert_audit_batch, rows)
+        except Exception as e:
+            logger.error(f"Error writing audit batch: {e}")
 
 def cleanup_loop():
     """Background thread to clean up old logs every minute."""
@@ -115,19 +193,6 @@ db.init_db()
 
 agent = IncidentResponseAgent(db)
 
-def agent_runner():
-    """Background thread to run the agent loop."""
-    logger.info("Agent runner thread started.")
-    # Create a new event loop for the async agent
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
-    try:
-        loop.run_until_complete(agent.run_forever(interval_seconds=60))
-    except Exception as e:
-        logger.error(f"Agent loop failed: {e}")
-    finally:
-        loop.close()
-
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
@@ -137,13 +202,18 @@ async def lifespan(app: FastAPI):
     cleanup_thread = threading.Thread(target=cleanup_loop, daemon=True)
     cleanup_thread.start()
     
-    # Start Agent
-    agent_thread = threading.Thread(target=agent_runner, daemon=True)
-    agent_thread.start()
+    # Start Agent on the server's event loop
+    agent_task = asyncio.create_task(agent.run_forever(interval_seconds=60))
+    audit_task = asyncio.create_task(audit_writer())
     
     yield
     # Shutdown
+    audit_queue.put_nowait(None)  # Flush pending audit entries, then stop
+    await audit_task
     agent.stop()
+    agent_task.cancel()
+    with contextlib.suppress(asyncio.CancelledError):
+        await agent_task
     
 app = FastAPI(title="Volt Brain API", lifespan=lifespan)
 
@@ -160,44 +230,91 @@ app.add_middleware(
 SERVER_START_TIME = time.time()
 
 # Tool metrics tracker for real statistics
+MAX_TOOLS = 64
+
 class ToolMetrics:
-    """Track tool call statistics."""
+    """
+    Track tool call statistics.
+    
+    Counters live in preallocated arrays indexed by a stable per-tool id, so
+    recording a call is a few GIL-guarded array updates. Only registering a
+    new tool name takes the lock.
+    """
     def __init__(self):
-        self._metrics = {}
+        self._tool_ids: dict[str, int] = {}
+        self._call_count = array('Q', [0] * MAX_TOOLS)
+        self._total_rt_ns = array('Q', [0] * MAX_TOOLS)
+        self._last_called_ns = array('Q', [0] * MAX_TOOLS)
+        self._stats_cache: dict[int, tuple[tuple[int, int], dict]] = {}
         self._lock = threading.Lock()
     
+    def _register(self, tool_name: str) -> int:
+        """Assign a stable id to a tool name."""
+        with self._lock:
+            tool_id = self._tool_ids.get(tool_name)
+            if tool_id is None:
+                if len(self._tool_ids) >= MAX_TOOLS:
+                    raise ValueError(f"Cannot track more than {MAX_TOOLS} tools")
+                tool_id = len(self._tool_ids)
+                self._tool_ids[tool_name] = tool_id
+            return tool_id
+    
     def record_call(self, tool_name: str, response_time_ms: float):
         """Record a tool call with its response time."""
-        with self._lock:
-            if tool_name not in self._metrics:
-                self._metrics[tool_name] = {
-                    "callCount": 0,
-                    "totalResponseTime": 0,
-                    "lastCalled": None
-                }
-            self._metrics[tool_name]["callCount"] += 1
-            self._metrics[tool_name]["totalResponseTime"] += response_time_ms
-            self._metrics[tool_name]["lastCalled"] = datetime.utcnow()
+        tool_id = self._tool_ids.get(tool_name)
+        if tool_id is None:
+            tool_id = self._register(tool_name)
+        # Bump the count last: get_stats keys its cache on it, so a reader
+        # that sees the new count also sees the new totals
+        self._total_rt_ns[tool_id] += max(0, int(response_time_ms * 1_000_000))
+        self._last_called_ns[tool_id] = time.time_ns()
+        self._call_count[tool_id] += 1
     
     def get_stats(self, tool_name: str) -> dict:
         """Get statistics for a tool."""
-        with self._lock:
-            if tool_name not in self._metrics:
-                return {
-                    "callCount": 0,
-                    "avgResponseTime": 0,
-                    "lastCalled": None
-                }
-            m = self._metrics[tool_name]
-            avg = m["totalResponseTime"] / m["callCount"] if m["callCount"] > 0 else 0
+        tool_id = self._tool_ids.get(tool_name)
+        if tool_id is None:
             return {
-                "callCount": m["callCount"],
-                "avgResponseTime": int(avg),
-                "lastCalled": m["lastCalled"].isoformat() + "Z" if m["lastCalled"] else None
+                "callCount": 0,
+                "avgResponseTime": 0,
+                "lastCalled": None
             }
+        call_count = self._call_count[tool_id]
+        last_called_ns = self._last_called_ns[tool_id]
+        cache_key = (call_count, last_called_ns)
+        cached = self._stats_cache.get(tool_id)
+        if cached is not None and cached[0] == cache_key:
+            return cached[1]
+        
+        total_rt_ns = self._total_rt_ns[tool_id]
+        
+        # Timestamps are only rendered on read
+        avg_ms = total_rt_ns / call_count / 1_000_000 if call_count > 0 else 0
+        last_called = None
+        if last_called_ns:
+            last_called = datetime.utcfromtimestamp(last_called_ns / 1e9).isoformat() + "Z"
+        stats = {
+            "callCount": call_count,
+            "avgResponseTime": int(avg_ms),
+            "lastCalled": last_called
+        }
+        self._stats_cache[tool_id] = (cache_key, stats)
+        return stats
 
 tool_metrics = ToolMetrics()
 
+# (name, category, needs_k8s) for each tool reported in /api/system/status
+TOOLS = [
+    # Telemetry Tools
+    ("prom_query", "Telemetry", False),
+    ("tail_logs", "Telemetry", False),
+    ("get_events", "Telemetry", True),
+    # Remediation Tools
+    ("rollout_restart", "Remediation", True),
+    ("scale_deployment", "Remediation", True),
+    ("delete_pod", "Remediation", True),
+]
+
 
 @app.post("/api/v1/receive")
 async def receive_metrics(request: Request):
@@ -210,13 +327,14 @@ async def receive_metrics(request: Request):
         
         # 2. Decompress using Snappy
         try:
-            uncompressed_data = snappy.uncompress(body)
+            uncompressed_data = bytes(cramjam.snappy.decompress_raw(body))
         except Exception as e:
             logger.error(f"Snappy decompression failed: {e}")
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Snappy decompression failed")
 
         # 3. Parse Protobuf
-        write_request = remote_pb2.WriteRequest()
+        # ParseFromString clears the reused message before parsing
+        write_request = _reusable_message("write_req", remote_pb2.WriteRequest)
         try:
             write_request.ParseFromString(uncompressed_data)
         except Exception as e:
@@ -270,13 +388,13 @@ async def receive_logs(request: Request):
         
         # 2. Decompress using Snappy
         try:
-            uncompressed_data = snappy.uncompress(body)
+            uncompressed_data = bytes(cramjam.snappy.decompress_raw(body))
         except Exception as e:
             logger.error(f"Snappy decompression failed: {e}")
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Snappy decompression failed")
 
         # 3. Parse Protobuf
-        push_request = logproto_pb2.PushRequest()
+        push_request = _reusable_message("push_req", logproto_pb2.PushRequest)
         try:
             push_request.ParseFromString(uncompressed_data)
         except Exception as e:
@@ -325,7 +443,7 @@ async def receive_logs(request: Request):
             s3_client.put_object(
                 Bucket=S3_BUCKET,
                 Key=filename,
-                Body=json.dumps(logs_data),
+                Body=orjson.dumps(logs_data),
                 ContentType='application/json',
                 ACL='private' 
             )
@@ -352,39 +470,77 @@ def health_check():
 # Brain UI API Endpoints
 # =============================================
 
-# ---------- Pydantic Models ----------
+# ---------- Request Models ----------
 
-class ApprovalRequest(BaseModel):
+class ApprovalRequest(msgspec.Struct):
     incident_id: str
 
-class IssueCreateRequest(BaseModel):
+class IssueCreateRequest(msgspec.Struct):
     incident_id: str
 
+async def _decode_body(request: Request, model: type):
+    """Decode and validate a JSON request body into a msgspec Struct."""
+    try:
+        return msgspec.json.decode(await request.body(), type=model)
+    except (msgspec.ValidationError, msgspec.DecodeError) as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+def _request_body(model: type) -> dict:
+    """OpenAPI requestBody for an endpoint that decodes `model` with _decode_body."""
+    _, components = msgspec.json.schema_components((model,))
+    return {
+        "requestBody": {
+            "required": True,
+            "content": {"application/json": {"schema": components[model.__name__]}}
+        }
+    }
+
 # ---------- Helper Functions ----------
 
+class OrjsonResponse(Response):
+    """JSON response encoded with orjson; return it directly so FastAPI skips jsonable_encoder."""
+    media_type = "application/json"
+
+    def render(self, content) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NAIVE_UTC | orjson.OPT_UTC_Z)
+
+def _ev(value):
+    """Return the value of an Enum member, or the value itself if it is already plain."""
+    return value.value if isinstance(value, Enum) else value
+
+_STATUS_MAP = {
+    "reject": "rejected",
+    "approval": "pending_approval",
+    "escalate": "escalated",
+}
+
 def _map_incident_status(decision_type: str, action_result: any) -> str:
     """Map decision type to UI status."""
-    if decision_type == "reject":
-        return "rejected"
-    elif decision_type == "auto_fix":
+    if decision_type == "auto_fix":
         if action_result and action_result.get("status") == "completed":
             return "resolved"
         return "remediating"
-    elif decision_type == "approval":
-        return "pending_approval"
-    elif decision_type == "escalate":
-        return "escalated"
-    return "detected"
+    return _STATUS_MAP.get(decision_type, "detected")
 
 def _format_incident(report) -> dict:
-    """Format an IncidentReport for the UI."""
+    """Format an IncidentReport for the UI (memoized until the report changes)."""
+    if report._formatted_cache is not None and report._format_cached_version == report._format_version:
+        return report._formatted_cache
+    
+    formatted = _build_incident_dict(report)
+    report._formatted_cache = formatted
+    report._format_cached_version = report._format_version
+    return formatted
+
+def _build_incident_dict(report) -> dict:
+    """Build the UI representation of an IncidentReport."""
     incident = report.incident
     rca = report.rca
     decision = report.decision
     action_result = report.action_result
     
     status = _map_incident_status(
-        decision.decision_type.value if hasattr(decision.decision_type, 'value') else decision.decision_type,
+        _ev(decision.decision_type),
         action_result.to_dict() if action_result else None
     )
     
@@ -393,10 +549,10 @@ def _format_incident(report) -> dict:
         "title": f"{incident.incident_type.replace('_', ' ').title()} on {incident.source}",
         "description": rca.root_cause if rca else "Analysis pending",
         "status": status,
-        "severity": incident.severity.value if hasattr(incident.severity, 'value') else incident.severity,
+        "severity": _ev(incident.severity),
         "confidence": rca.confidence if rca else 0.0,
-        "detectedAt": incident.detected_at.isoformat() + "Z" if incident.detected_at else None,
-        "updatedAt": report.created_at.isoformat() + "Z" if report.created_at else None,
+        "detectedAt": incident.detected_iso,
+        "updatedAt": report.created_iso,
         "namespace": incident.namespace,
         "service": incident.source,
         "affectedPods": [incident.source],
@@ -410,7 +566,7 @@ def _format_incident(report) -> dict:
             "status": "pending" if decision.requires_approval else "approved",
             "description": decision.reasoning,
             "target": incident.source,
-            "riskLevel": decision.risk_level.value if hasattr(decision.risk_level, 'value') else decision.risk_level,
+            "riskLevel": _ev(decision.risk_level),
             "requiresApproval": decision.requires_approval,
             "blastRadius": f"{incident.namespace} namespace",
             "rollbackPlan": rca.rollback_guidance if rca else "Rollback by reverting changes"
@@ -438,30 +594,29 @@ async def api_health():
 async def get_incidents(limit: int = Query(50, ge=1, le=500)):
     """List all incidents."""
     incidents = [_format_incident(r) for r in agent.incidents]
-    return {
+    return OrjsonResponse({
         "incidents": incidents[:limit],
         "total": len(incidents)
-    }
+    })
 
 @app.get("/api/incidents/{incident_id}")
 async def get_incident(incident_id: str):
     """Get a specific incident by ID."""
-    for report in agent.incidents:
-        if report.incident.id == incident_id:
-            return _format_incident(report)
-    raise HTTPException(status_code=404, detail="Incident not found")
+    report = agent.incidents_by_id.get(incident_id)
+    if report is None:
+        raise HTTPException(status_code=404, detail="Incident not found")
+    return _format_incident(report)
 
 # ---------- Pending Approvals ----------
 
 @app.get("/api/pending")
 async def get_pending():
     """Get pending approvals."""
-    pending = []
-    for report in agent.incidents:
-        if report.decision and report.decision.requires_approval:
-            # Check if not yet executed
-            if not report.action_result or report.action_result.status.value in ["pending", "executing"]:
-                pending.append(_format_incident(report))
+    reports = sorted(
+        (agent.incidents_by_id[incident_id] for incident_id in agent.pending_ids),
+        key=lambda r: r.created_at
+    )
+    pending = [_format_incident(r) for r in reports]
     return {
         "pending": pending,
         "count": len(pending)
@@ -469,68 +624,70 @@ async def get_pending():
 
 # ---------- Actions ----------
 
-@app.post("/api/approve")
-async def approve_incident(request: ApprovalRequest):
+@app.post("/api/approve", openapi_extra=_request_body(ApprovalRequest))
+async def approve_incident(request: Request):
     """Approve an incident for remediation."""
-    incident_id = request.incident_id
+    payload = await _decode_body(request, ApprovalRequest)
+    incident_id = payload.incident_id
     
-    for report in agent.incidents:
-        if report.incident.id == incident_id:
-            if report.decision and report.decision.action:
-                # Execute the remediation
-                try:
-                    result = await agent.executor.execute(report.decision.action, report.incident)
-                    report.action_result = result
-                    
-                    # Log to audit
-                    db.insert_audit_entry(
-                        entry_id=f"audit-{uuid.uuid4()}",
-                        action="approve_remediation",
-                        actor="human",
-                        target=incident_id,
-                        details=f"Approved {report.decision.action} on {report.incident.source}",
-                        result="success" if result.status.value == "completed" else "failure"
-                    )
-                    
-                    return {
-                        "success": True,
-                        "message": f"Remediation executed: {report.decision.action}",
-                        "action_result": result.to_dict() if result else None
-                    }
-                except Exception as e:
-                    logger.error(f"Remediation failed: {e}")
-                    return {
-                        "success": False,
-                        "message": str(e)
-                    }
-            else:
-                return {"success": False, "message": "No action available for this incident"}
-    
-    raise HTTPException(status_code=404, detail="Incident not found")
-
-@app.post("/api/reject")
-async def reject_incident(request: ApprovalRequest):
+    report = agent.incidents_by_id.get(incident_id)
+    if report is None:
+        raise HTTPException(status_code=404, detail="Incident not found")
+    
+    if not (report.decision and report.decision.action):
+        return {"success": False, "message": "No action available for this incident"}
+    
+    # Execute the remediation
+    try:
+        result = await agent.executor.execute(report.decision.action, report.incident)
+        report.action_result = result
+        report.mark_updated()
+        agent.update_pending(report)
+        
+        # Log to audit
+        _record_audit(
+            action="approve_remediation",
+            actor="human",
+            target=incident_id,
+            details=f"Approved {report.decision.action} on {report.incident.source}",
+            result="success" if result.status.value == "completed" else "failure"
+        )
+        
+        return {
+            "success": True,
+            "message": f"Remediation executed: {report.decision.action}",
+            "action_result": result.to_dict() if result else None
+        }
+    except Exception as e:
+        logger.error(f"Remediation failed: {e}")
+        return {
+            "success": False,
+            "message": str(e)
+        }
+
+@app.post("/api/reject", openapi_extra=_request_body(ApprovalRequest))
+async def reject_incident(request: Request):
     """Reject an incident remediation."""
-    incident_id = request.incident_id
-    
-    for report in agent.incidents:
-        if report.incident.id == incident_id:
-            # Mark as rejected by updating decision
-            db.insert_audit_entry(
-                entry_id=f"audit-{uuid.uuid4()}",
-                action="reject_remediation",
-                actor="human",
-                target=incident_id,
-                details=f"Rejected remediation for {report.incident.source}",
-                result="success"
-            )
-            
-            return {
-                "success": True,
-                "message": "Incident remediation rejected"
-            }
+    payload = await _decode_body(request, ApprovalRequest)
+    incident_id = payload.incident_id
+    
+    report = agent.incidents_by_id.get(incident_id)
+    if report is None:
+        raise HTTPException(status_code=404, detail="Incident not found")
     
-    raise HTTPException(status_code=404, detail="Incident not found")
+    # Mark as rejected by updating decision
+    _record_audit(
+        action="reject_remediation",
+        actor="human",
+        target=incident_id,
+        details=f"Rejected remediation for {report.incident.source}",
+        result="success"
+    )
+    
+    return {
+        "success": True,
+        "message": "Incident remediation rejected"
+    }
 
 # ---------- Scans ----------
 
@@ -545,8 +702,7 @@ async def trigger_scan(namespace: Optional[str] = None):
             report = await agent.process_incident(candidate)
             reports.append(_format_incident(report))
         
-        db.insert_audit_entry(
-            entry_id=f"audit-{uuid.uuid4()}",
+        _record_audit(
             action="manual_scan",
             actor="human",
             target=namespace or "all",
@@ -604,16 +760,43 @@ async def get_cluster_metrics():
     tool_metrics.record_call("prom_query", elapsed_ms)
     return result
 
+# ---------- Streaming ----------
+
+STREAM_CHUNK_ROWS = 100
+
+def _stream_rows(key: str, rows: Iterator[dict], on_done=None) -> StreamingResponse:
+    """
+    Stream {key: [...], "total": n} as rows come off the cursor.
+    
+    The body is a sync generator, so Starlette advances it (and the SQLite
+    cursor behind it) in the threadpool. Rows are flushed in small chunks.
+    """
+    def body():
+        total = 0
+        chunk = [b'{"' + key.encode() + b'":[']
+        try:
+            for row in rows:
+                if total:
+                    chunk.append(b",")
+                chunk.append(orjson.dumps(row, option=orjson.OPT_NAIVE_UTC | orjson.OPT_UTC_Z))
+                total += 1
+                if total % STREAM_CHUNK_ROWS == 0:
+                    yield b"".join(chunk)
+                    chunk = []
+            chunk.append(b'],"total":%d}' % total)
+            yield b"".join(chunk)
+        finally:
+            if on_done:
+                on_done()
+    
+    return StreamingResponse(body(), media_type="application/json")
+
 # ---------- Audit Log ----------
 
 @app.get("/api/audit")
 async def get_audit_log(limit: int = Query(100, ge=1, le=1000)):
     """Get audit log entries."""
-    entries = db.get_audit_log(limit)
-    return {
-        "entries": entries,
-        "total": len(entries)
-    }
+    return _stream_rows("entries", db.iter_audit_log(limit))
 
 # ---------- Telemetry ----------
 
@@ -625,14 +808,12 @@ async def get_telemetry_logs(
 ):
     """Get system logs."""
     start_time = time.time()
-    logs = db.get_logs(namespace=namespace, pod=pod, limit=limit)
-    elapsed_ms = (time.time() - start_time) * 1000
-    tool_metrics.record_call("tail_logs", elapsed_ms)
     
-    return {
-        "logs": logs,
-        "total": len(logs)
-    }
+    def record():
+        elapsed_ms = (time.time() - start_time) * 1000
+        tool_metrics.record_call("tail_logs", elapsed_ms)
+    
+    return _stream_rows("logs", db.iter_logs(namespace=namespace, pod=pod, limit=limit), on_done=record)
 
 @app.get("/api/telemetry/events")
 async def get_telemetry_events(
@@ -670,8 +851,7 @@ async def get_system_status():
     namespace_count = 1
     if k8s_toolbox:
         try:
-            namespaces = k8s_toolbox.core_v1.list_namespace()
-            namespace_count = len(namespaces.items)
+            namespace_count = k8s_toolbox.count_namespaces()
         except Exception:
             pass
     
@@ -693,14 +873,8 @@ async def get_system_status():
         }
     
     tools = [
-        # Telemetry Tools
-        build_tool_entry("prom_query", "Telemetry", True),
-        build_tool_entry("tail_logs", "Telemetry", True),
-        build_tool_entry("get_events", "Telemetry", k8s_connected),
-        # Remediation Tools
-        build_tool_entry("rollout_restart", "Remediation", k8s_connected),
-        build_tool_entry("scale_deployment", "Remediation", k8s_connected),
-        build_tool_entry("delete_pod", "Remediation", k8s_connected)
+        build_tool_entry(name, category, k8s_connected or not needs_k8s)
+        for name, category, needs_k8s in TOOLS
     ]
     
     # Calculate cluster resource percentages for gateway
@@ -712,7 +886,7 @@ async def get_system_status():
         if cluster_metrics["memory"]["capacity"] > 0:
             memory_percent = int((cluster_metrics["memory"]["usage"] / cluster_metrics["memory"]["capacity"]) * 100)
     
-    return {
+    return OrjsonResponse({
         "gateway": {
             "connected": k8s_connected,
             "status": "connected" if k8s_connected else "disconnected",
@@ -729,7 +903,7 @@ async def get_system_status():
             "status": "running",
             "uptime": uptime_ms,
             "incidentsProcessed": len(agent.incidents),
-            "pendingApprovals": len([r for r in agent.incidents if r.decision and r.decision.requires_approval])
+            "pendingApprovals": len(agent.pending_ids)
         },
         "tools": tools,
         "prometheus": {
@@ -758,127 +932,113 @@ async def get_system_status():
             "name": "volt-cluster",
             "version": k8s_version.get("version", "unknown")
         }
-    }
+    })
 
 # ---------- Issues ----------
 
 @app.get("/api/issues")
-async def get_issues():
-    """List all issues."""
-    issues = db.get_issues()
-    
-    # Calculate counts
-    counts = {"open": 0, "fixing": 0, "resolved": 0, "needs_attention": 0}
-    for issue in issues:
-        status = issue.get("status", "open")
-        if status in counts:
-            counts[status] += 1
+async def get_issues(limit: int = Query(100, ge=1, le=1000)):
+    """List the most recent issues with per-status counts."""
+    issues = await run_in_threadpool(db.get_issues, limit)
+    counts, total = await run_in_threadpool(db.get_issue_status_counts)
     
-    return {
+    return OrjsonResponse({
         "issues": issues,
-        "total": len(issues),
+        "total": total,
         "counts": counts
-    }
+    })
 
 @app.get("/api/issues/{issue_id}")
 async def get_issue(issue_id: str):
     """Get a specific issue."""
-    issue = db.get_issue(issue_id)
+    issue = await run_in_threadpool(db.get_issue, issue_id)
     if not issue:
         raise HTTPException(status_code=404, detail="Issue not found")
     
     # Attach incident data if available
-    incident_id = issue.get("incidentId")
-    for report in agent.incidents:
-        if report.incident.id == incident_id:
-            issue["incident"] = _format_incident(report)
-            break
+    report = agent.incidents_by_id.get(issue.get("incidentId"))
+    if report is not None:
+        issue["incident"] = _format_incident(report)
     
     return issue
 
-@app.post("/api/issues")
-async def create_issue(request: IssueCreateRequest):
+@app.post("/api/issues", openapi_extra=_request_body(IssueCreateRequest))
+async def create_issue(request: Request):
     """Create a new issue from an incident."""
-    incident_id = request.incident_id
+    payload = await _decode_body(request, IssueCreateRequest)
+    incident_id = payload.incident_id
     
     # Verify incident exists
-    incident_found = False
-    for report in agent.incidents:
-        if report.incident.id == incident_id:
-            incident_found = True
-            break
-    
-    if not incident_found:
+    if incident_id not in agent.incidents_by_id:
         raise HTTPException(status_code=404, detail="Incident not found")
     
     issue_id = f"issue-{uuid.uuid4()}"
-    result = db.insert_issue(issue_id, incident_id, "open")
+    result = await run_in_threadpool(db.insert_issue, issue_id, incident_id, "open")
     
     if result:
-        db.insert_audit_entry(
-            entry_id=f"audit-{uuid.uuid4()}",
+        _record_audit(
             action="create_issue",
             actor="human",
             target=issue_id,
             details=f"Created issue from incident {incident_id}",
             result="success"
         )
-        return db.get_issue(issue_id)
+        return await run_in_threadpool(db.get_issue, issue_id)
     
     raise HTTPException(status_code=500, detail="Failed to create issue")
 
 @app.post("/api/issues/{issue_id}/execute")
 async def execute_remediation(issue_id: str):
     """Execute remediation for an issue."""
-    issue = db.get_issue(issue_id)
+    issue = await run_in_threadpool(db.get_issue, issue_id)
     if not issue:
         raise HTTPException(status_code=404, detail="Issue not found")
     
     incident_id = issue.get("incidentId")
     
     # Find and execute remediation
-    for report in agent.incidents:
-        if report.incident.id == incident_id:
-            if report.decision and report.decision.action:
-                try:
-                    # Update status
-                    db.update_issue(issue_id, status="fixing")
-                    
-                    result = await agent.executor.execute(report.decision.action, report.incident)
-                    report.action_result = result
-                    
-                    # Update issue with attempt
-                    attempts = issue.get("remediationAttempts", [])
-                    attempts.append({
-                        "id": f"attempt-{uuid.uuid4()}",
-                        "action": report.decision.action,
-                        "target": report.incident.source,
-                        "status": result.status.value,
-                        "executedAt": datetime.utcnow().isoformat() + "Z",
-                        "result": result.result if result.result else None,
-                        "error": result.error
-                    })
-                    
-                    new_status = "resolved" if result.status.value == "completed" else "needs_attention"
-                    db.update_issue(issue_id, status=new_status, remediation_attempts=attempts)
-                    
-                    db.insert_audit_entry(
-                        entry_id=f"audit-{uuid.uuid4()}",
-                        action="execute_remediation",
-                        actor="system",
-                        target=issue_id,
-                        details=f"Executed {report.decision.action}",
-                        result="success" if result.status.value == "completed" else "failure"
-                    )
-                    
-                    return {
-                        "success": result.status.value == "completed",
-                        "message": f"Executed {report.decision.action}",
-                        "issue": db.get_issue(issue_id)
-                    }
-                except Exception as e:
-                    db.update_issue(issue_id, status="needs_attention")
-                    return {"success": False, "message": str(e), "issue": db.get_issue(issue_id)}
+    report = agent.incidents_by_id.get(incident_id)
+    if report is not None and report.decision and report.decision.action:
+        try:
+            # Update status
+            await run_in_threadpool(db.update_issue, issue_id, status="fixing")
+            
+            result = await agent.executor.execute(report.decision.action, report.incident)
+            report.action_result = result
+            report.mark_updated()
+            agent.update_pending(report)
+            
+            # Update issue with attempt
+            attempts = issue.get("remediationAttempts", [])
+            attempts.append({
+                "id": f"attempt-{uuid.uuid4()}",
+                "action": report.decision.action,
+                "target": report.incident.source,
+                "status": result.status.value,
+                "executedAt": datetime.utcnow().isoformat() + "Z",
+                "result": result.result if result.result else None,
+                "error": result.error
+            })
+            
+            new_status = "resolved" if result.status.value == "completed" else "needs_attention"
+            await run_in_threadpool(db.update_issue, issue_id, status=new_status, remediation_attempts=attempts)
+            
+            _record_audit(
+                action="execute_remediation",
+                actor="system",
+                target=issue_id,
+                details=f"Executed {report.decision.action}",
+                result="success" if result.status.value == "completed" else "failure"
+            )
+            
+            return {
+                "success": result.status.value == "completed",
+                "message": f"Executed {report.decision.action}",
+                "issue": await run_in_threadpool(db.get_issue, issue_id)
+            }
+        except Exception as e:
+            await run_in_threadpool(db.update_issue, issue_id, status="needs_attention")
+            return {"success": False, "message": str(e), "issue": await run_in_threadpool(db.get_issue, issue_id)}
     
     return {"success": False, "message": "No remediation available", "issue": issue}
 
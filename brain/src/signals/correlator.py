@@ -5,14 +5,21 @@ Groups and correlates signals to identify potential incidents.
 """
 
 import logging
+import time
+from collections import defaultdict
 from dataclasses import dataclass, field
-from datetime import datetime, timedelta
+from datetime import datetime
+from functools import cached_property
 from typing import Any
 
 from .normalizer import Signal, SignalType, SignalSeverity
 
 logger = logging.getLogger(__name__)
 
+# Module-level aliases avoid an enum attribute lookup per signal
+_CRITICAL = SignalSeverity.CRITICAL
+_WARNING = SignalSeverity.WARNING
+
 
 @dataclass
 class IncidentCandidate:
@@ -28,23 +35,44 @@ class IncidentCandidate:
     detected_at: datetime = field(default_factory=datetime.utcnow)
     metadata: dict = field(default_factory=dict)
     
+    # Running aggregates so add_signal stays O(1)
+    _type_set: set[SignalType] = field(default_factory=set, init=False, repr=False, compare=False)
+    _critical_count: int = field(default=0, init=False, repr=False, compare=False)
+    _has_warning: bool = field(default=False, init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        for signal in self.signals:
+            self._track(signal)
+    
+    @cached_property
+    def detected_iso(self) -> str | None:
+        """UTC ISO-8601 detection time; detected_at never changes once set."""
+        return self.detected_at.isoformat() + "Z" if self.detected_at else None
+    
     def add_signal(self, signal: Signal):
         """Add a corroborating signal."""
         self.signals.append(signal)
+        self._track(signal)
         self._update_confidence()
     
+    def _track(self, signal: Signal):
+        """Fold a signal into the running aggregates."""
+        self._type_set.add(signal.type)
+        if signal.severity == _CRITICAL:
+            self._critical_count += 1
+        elif signal.severity == _WARNING:
+            self._has_warning = True
+    
     def _update_confidence(self):
         """Recalculate confidence based on signals."""
         # More signals = higher confidence
         signal_count = len(self.signals)
         
         # Different signal types boost confidence more
-        signal_types = set(s.type for s in self.signals)
-        type_boost = len(signal_types) * 0.1
+        type_boost = len(self._type_set) * 0.1
         
         # Critical severity signals boost confidence
-        critical_count = sum(1 for s in self.signals if s.severity == SignalSeverity.CRITICAL)
-        critical_boost = critical_count * 0.15
+        critical_boost = self._critical_count * 0.15
         
         # Base confidence from signal count
         base_confidence = min(0.5, signal_count * 0.15)
@@ -52,9 +80,9 @@ class IncidentCandidate:
         self.confidence = min(1.0, base_confidence + type_boost + critical_boost)
         
         # Update overall severity
-        if any(s.severity == SignalSeverity.CRITICAL for s in self.signals):
+        if self._critical_count > 0:
             self.severity = SignalSeverity.CRITICAL
-        elif any(s.severity == SignalSeverity.WARNING for s in self.signals):
+        elif self._has_warning:
             self.severity = SignalSeverity.WARNING
     
     def to_dict(self) -> dict:
@@ -79,12 +107,23 @@ class SignalCorrelator:
     """
     
     def __init__(self, time_window_minutes: int = 5):
-        self.time_window = timedelta(minutes=time_window_minutes)
+        self.time_window_ns = time_window_minutes * 60 * 1_000_000_000
         self._incident_counter = 0
+        self._id_prefix_sec = -1
+        self._id_prefix = ""
     
     def _generate_id(self) -> str:
+        # Candidates arrive in bursts; rebuild the UTC timestamp prefix once per second
+        now_s = int(time.time())
+        if now_s != self._id_prefix_sec:
+            t = time.gmtime(now_s)
+            self._id_prefix_sec = now_s
+            self._id_prefix = (
+                f"{t.tm_year:04d}{t.tm_mon:02d}{t.tm_mday:02d}"
+                f"{t.tm_hour:02d}{t.tm_min:02d}{t.tm_sec:02d}"
+            )
         self._incident_counter += 1
-        return f"INC-{datetime.utcnow().strftime('%Y%m%d%H%M%S')}-{self._incident_counter:04d}"
+        return f"INC-{self._id_prefix}-{self._incident_counter:04d}"
     
     def correlate(
         self,
@@ -101,51 +140,95 @@ class SignalCorrelator:
         Returns:
             List of incident candidates
         """
+        return self.correlate_and_filter(signals, incident_type, min_confidence=0.0, min_signals=0)
+    
+    def correlate_and_filter(
+        self,
+        signals: list[Signal],
+        incident_type: str,
+        min_confidence: float = 0.3,
+        min_signals: int = 2
+    ) -> list[IncidentCandidate]:
+        """
+        Correlate signals and drop likely false positives in a single pass.
+        
+        Candidates are only assigned an incident ID once they pass the
+        false-positive gate, so rejected groups do not consume IDs.
+        
+        Args:
+            signals: List of normalized signals
+            incident_type: Type of incident being detected
+            min_confidence: Minimum confidence threshold
+            min_signals: Minimum number of corroborating signals
+        
+        Returns:
+            List of accepted incident candidates
+        """
         if not signals:
             return []
         
         # Group by namespace + source
-        groups: dict[str, list[Signal]] = {}
+        groups: dict[tuple[str, str], list[Signal]] = defaultdict(list)
         for signal in signals:
-            key = f"{signal.namespace}/{signal.source}"
-            if key not in groups:
-                groups[key] = []
-            groups[key].append(signal)
+            groups[(signal.namespace, signal.source)].append(signal)
         
-        # Create incident candidates for groups with sufficient signals
+        # Only signals newer than the cutoff count towards an incident
+        cutoff = time.time_ns() - self.time_window_ns
+        
+        # Create incident candidates for groups with at least one recent signal
         candidates = []
-        for key, group_signals in groups.items():
-            # Filter by time window
-            now = datetime.utcnow()
-            recent_signals = [
-                s for s in group_signals
-                if now - s.timestamp < self.time_window
-            ]
+        rejected = 0
+        for (namespace, source), group_signals in groups.items():
+            candidate = None
+            for signal in group_signals:
+                if signal.timestamp <= cutoff:
+                    continue
+                if candidate is None:
+                    candidate = IncidentCandidate(
+                        id="",
+                        incident_type=incident_type,
+                        source=source,
+                        namespace=namespace
+                    )
+                candidate.add_signal(signal)
+            
+            if candidate is None:
+                continue
             
-            if not recent_signals:
+            reason = self._rejection_reason(candidate, min_confidence, min_signals)
+            if reason:
+                logger.debug(f"Rejecting {incident_type} on {namespace}/{source}: {reason}")
+                rejected += 1
                 continue
             
-            # Create candidate if we have enough evidence
-            if len(recent_signals) >= 1:  # At least 1 signal
-                namespace, source = key.split("/", 1)
-                candidate = IncidentCandidate(
-                    id=self._generate_id(),
-                    incident_type=incident_type,
-                    source=source,
-                    namespace=namespace
-                )
-                
-                for signal in recent_signals:
-                    candidate.add_signal(signal)
-                
-                candidates.append(candidate)
-                logger.info(
-                    f"Incident candidate: {candidate.id} - {incident_type} "
-                    f"on {key} (confidence: {candidate.confidence:.2f})"
-                )
+            candidate.id = self._generate_id()
+            candidates.append(candidate)
+            logger.info(
+                f"Incident candidate: {candidate.id} - {incident_type} "
+                f"on {namespace}/{source} (confidence: {candidate.confidence:.2f})"
+            )
+        
+        if rejected > 0:
+            logger.info(f"Filtered out {rejected} false positive candidates")
         
         return candidates
     
+    def _rejection_reason(
+        self,
+        candidate: IncidentCandidate,
+        min_confidence: float,
+        min_signals: int
+    ) -> str | None:
+        """Return why a candidate is a likely false positive, or None to keep it."""
+        if candidate.confidence < min_confidence:
+            return f"confidence {candidate.confidence:.2f} < {min_confidence}"
+        
+        # Exception: single critical signal is enough
+        if len(candidate.signals) < min_signals and candidate._critical_count == 0:
+            return f"only {len(candidate.signals)} signals"
+        
+        return None
+    
     def filter_false_positives(
         self,
         candidates: list[IncidentCandidate],
@@ -165,21 +248,11 @@ class SignalCorrelator:
         """
         filtered = []
         for candidate in candidates:
-            # Check minimum requirements
-            if candidate.confidence < min_confidence:
-                logger.debug(
-                    f"Rejecting {candidate.id}: confidence {candidate.confidence:.2f} < {min_confidence}"
-                )
+            reason = self._rejection_reason(candidate, min_confidence, min_signals)
+            if reason:
+                logger.debug(f"Rejecting {candidate.id}: {reason}")
                 continue
             
-            if len(candidate.signals) < min_signals:
-                # Exception: single critical signal is enough
-                if not any(s.severity == SignalSeverity.CRITICAL for s in candidate.signals):
-                    logger.debug(
-                        f"Rejecting {candidate.id}: only {len(candidate.signals)} signals"
-                    )
-                    continue
-            
             filtered.append(candidate)
         
         rejected = len(candidates) - len(filtered)
@@ -5,11 +5,29 @@ Converts raw telemetry data into normalized signals for correlation.
 """
 
 import logging
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass, field
-from datetime import datetime
+from datetime import datetime, timezone
 from enum import Enum
 from typing import Any
 
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+    ahocorasick = None
+
+try:
+    import re2 as _regex  # linear-time DFA matcher
+    RE2_AVAILABLE = True
+except ImportError:
+    import re as _regex
+    RE2_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
 
@@ -25,9 +43,19 @@ class SignalSeverity(str, Enum):
     CRITICAL = "critical"
 
 
-@dataclass
+# Plain-string lookups for the serialization hot path (avoids enum .value access)
+_TYPE = {member: member.value for member in SignalType}
+_SEV = {member: member.value for member in SignalSeverity}
+
+
+@dataclass(slots=True)
 class Signal:
-    """Normalized signal from telemetry."""
+    """
+    Normalized signal from telemetry.
+    
+    Slotted: one is created per matching log line, so dropping the
+    per-instance __dict__ roughly halves the footprint.
+    """
     
     type: SignalType
     source: str  # pod name, deployment, node
@@ -35,20 +63,130 @@ class Signal:
     name: str  # metric name, log pattern, event type
     value: Any
     severity: SignalSeverity = SignalSeverity.INFO
-    timestamp: datetime = field(default_factory=datetime.utcnow)
+    timestamp: int = field(default_factory=time.time_ns)  # unix nanoseconds
     metadata: dict = field(default_factory=dict)
+    _cached_dict: dict | None = field(default=None, init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        # Low-cardinality identifiers repeat across thousands of signals;
+        # interning shares one copy and makes grouping/set hashing cheap
+        if isinstance(self.source, str):
+            self.source = sys.intern(self.source)
+        if isinstance(self.namespace, str):
+            self.namespace = sys.intern(self.namespace)
+        if isinstance(self.name, str):
+            self.name = sys.intern(self.name)
+    
+    @property
+    def iso_timestamp(self) -> str:
+        """UTC ISO-8601 form of timestamp, formatted on demand."""
+        return datetime.fromtimestamp(self.timestamp / 1e9, tz=timezone.utc).isoformat()
     
     def to_dict(self) -> dict:
-        return {
-            "type": self.type.value,
-            "source": self.source,
-            "namespace": self.namespace,
-            "name": self.name,
-            "value": self.value,
-            "severity": self.severity.value,
-            "timestamp": self.timestamp.isoformat(),
-            "metadata": self.metadata
-        }
+        # Signals are immutable after normalization, so build the dict once
+        if self._cached_dict is None:
+            self._cached_dict = {
+                "type": _TYPE[self.type],
+                "source": self.source,
+                "namespace": self.namespace,
+                "name": self.name,
+                "value": self.value,
+                "severity": _SEV[self.severity],
+                "timestamp": self.timestamp // 1_000_000,  # epoch ms
+                "metadata": self.metadata
+            }
+        return self._cached_dict
+
+
+# Log error patterns in priority order: when several match a line, the first wins.
+# Needles are lowercase and matched against the lowercased line, except those in
+# CASE_SENSITIVE_PATTERNS, which are matched as-is ("oom" would hit "room", "zoom").
+LOG_ERROR_PATTERNS = [
+    ("OOM", SignalSeverity.CRITICAL, "out_of_memory"),
+    ("outofmemory", SignalSeverity.CRITICAL, "out_of_memory"),
+    ("killed", SignalSeverity.CRITICAL, "process_killed"),
+    ("timeout", SignalSeverity.WARNING, "timeout"),
+    ("connection refused", SignalSeverity.WARNING, "connection_refused"),
+    ("error", SignalSeverity.WARNING, "error"),
+    ("failed", SignalSeverity.WARNING, "failure"),
+    ("no space left", SignalSeverity.CRITICAL, "disk_full"),
+    ("disk full", SignalSeverity.CRITICAL, "disk_full"),
+]
+CASE_SENSITIVE_PATTERNS = {"OOM"}
+
+_CASED_PATTERNS = [
+    (priority, pattern) for priority, (pattern, _, _) in enumerate(LOG_ERROR_PATTERNS)
+    if pattern in CASE_SENSITIVE_PATTERNS
+]
+_FOLDED_PATTERNS = [
+    (priority, pattern) for priority, (pattern, _, _) in enumerate(LOG_ERROR_PATTERNS)
+    if pattern not in CASE_SENSITIVE_PATTERNS
+]
+
+
+def _build_log_automaton():
+    """Compile the case-folded log patterns into one Aho-Corasick automaton (value = priority)."""
+    if not AHOCORASICK_AVAILABLE:
+        return None
+    automaton = ahocorasick.Automaton()
+    for priority, pattern in _FOLDED_PATTERNS:
+        automaton.add_word(pattern, priority)
+    automaton.make_automaton()
+    return automaton
+
+
+_LOG_AUTOMATON = _build_log_automaton()
+
+# Regex fallback: one alternation over every folded pattern, compiled once
+_LOG_PATTERN_PRIORITY = {pattern: priority for priority, pattern in _FOLDED_PATTERNS}
+_LOG_PATTERN_RE = _regex.compile("|".join(_regex.escape(pattern) for _, pattern in _FOLDED_PATTERNS))
+
+
+def _match_log_pattern(line: str) -> int | None:
+    """Return the priority index of the best pattern found in line, or None."""
+    best = None
+    for priority, pattern in _CASED_PATTERNS:
+        if pattern in line:
+            best = priority
+            break
+    if best == 0:
+        return best
+    
+    # Lowercase once, then a single scan covers every case variant
+    lower = line.lower()
+    if _LOG_AUTOMATON is not None:
+        # One walk over the line finds every pattern; keep the highest priority
+        matches = (priority for _, priority in _LOG_AUTOMATON.iter(lower))
+    else:
+        matches = (_LOG_PATTERN_PRIORITY[match.group(0)] for match in _LOG_PATTERN_RE.finditer(lower))
+    
+    for priority in matches:
+        if best is None or priority < best:
+            best = priority
+            if best == 0:
+                break
+    return best
+
+
+# Below this many lines a process pool costs more than it saves
+PARALLEL_MIN_LINES = 50_000
+
+
+def _init_scan_worker():
+    """Process pool initializer: make sure this worker has its own automaton."""
+    global _LOG_AUTOMATON
+    if _LOG_AUTOMATON is None:
+        _LOG_AUTOMATON = _build_log_automaton()
+
+
+def _scan_chunk(lines: list[str]) -> list[tuple[int, str]]:
+    """Return (priority, line) for every line in the chunk that matches a pattern."""
+    matches = []
+    for line in lines:
+        priority = _match_log_pattern(line)
+        if priority is not None:
+            matches.append((priority, line))
+    return matches
 
 
 class SignalNormalizer:
@@ -102,35 +240,54 @@ class SignalNormalizer:
         Normalize log lines into signals.
         Detects error patterns.
         """
-        signals = []
-        error_patterns = [
-            ("OOM", SignalSeverity.CRITICAL, "out_of_memory"),
-            ("OutOfMemory", SignalSeverity.CRITICAL, "out_of_memory"),
-            ("killed", SignalSeverity.CRITICAL, "process_killed"),
-            ("timeout", SignalSeverity.WARNING, "timeout"),
-            ("Timeout", SignalSeverity.WARNING, "timeout"),
-            ("connection refused", SignalSeverity.WARNING, "connection_refused"),
-            ("error", SignalSeverity.WARNING, "error"),
-            ("Error", SignalSeverity.WARNING, "error"),
-            ("failed", SignalSeverity.WARNING, "failure"),
-            ("Failed", SignalSeverity.WARNING, "failure"),
-            ("No space left", SignalSeverity.CRITICAL, "disk_full"),
-            ("disk full", SignalSeverity.CRITICAL, "disk_full"),
-        ]
+        return self._build_log_signals(_scan_chunk(log_lines), pod, namespace)
+    
+    def normalize_log_batch(
+        self,
+        log_lines: list[str],
+        pod: str,
+        namespace: str,
+        workers: int | None = None
+    ) -> list[Signal]:
+        """
+        Normalize a large batch of log lines, scanning chunks in parallel processes.
         
-        for line in log_lines:
-            for pattern, severity, signal_name in error_patterns:
-                if pattern in line:
-                    signals.append(Signal(
-                        type=SignalType.LOG,
-                        source=pod,
-                        namespace=namespace,
-                        name=signal_name,
-                        value=line,
-                        severity=severity,
-                        metadata={"pattern": pattern, "full_line": line}
-                    ))
-                    break  # Only one signal per line
+        Falls back to normalize_log for batches under PARALLEL_MIN_LINES.
+        Signal order matches the input line order.
+        """
+        workers = workers or os.cpu_count() or 1
+        if workers <= 1 or len(log_lines) < PARALLEL_MIN_LINES:
+            return self.normalize_log(log_lines, pod, namespace)
+        
+        chunk_size = -(-len(log_lines) // workers)
+        chunks = [log_lines[i:i + chunk_size] for i in range(0, len(log_lines), chunk_size)]
+        
+        matches = []
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_scan_worker) as pool:
+            for chunk_matches in pool.map(_scan_chunk, chunks):
+                matches.extend(chunk_matches)
+        
+        return self._build_log_signals(matches, pod, namespace)
+    
+    def _build_log_signals(
+        self,
+        matches: list[tuple[int, str]],
+        pod: str,
+        namespace: str
+    ) -> list[Signal]:
+        """Turn (priority, line) matches into log signals, one per line."""
+        signals = []
+        for priority, line in matches:
+            pattern, severity, signal_name = LOG_ERROR_PATTERNS[priority]
+            signals.append(Signal(
+                type=SignalType.LOG,
+                source=pod,
+                namespace=namespace,
+                name=signal_name,
+                value=line,
+                severity=severity,
+                metadata={"pattern": pattern, "full_line": line}
+            ))
         
         return signals
     
@@ -1,12 +1,74 @@
+import functools
+import heapq
 import logging
 import time
+from datetime import datetime, timezone
+from operator import itemgetter
 from typing import Any, Dict, List, Optional
 
+import orjson
 from kubernetes import client, config
 from kubernetes.client.rest import ApiException
 
 logger = logging.getLogger(__name__)
 
+# How long read-only cluster lookups are served from cache
+K8S_CACHE_TTL_SECONDS = 10
+# The server version only changes on a cluster upgrade
+VERSION_CACHE_TTL_SECONDS = 300
+
+# Page size for cluster-wide list calls
+LIST_PAGE_SIZE = 500
+
+# Binary suffixes used in node memory capacity quantities
+_MEM_MULT = {"Ki": 1024, "Mi": 1024 ** 2, "Gi": 1024 ** 3, "Ti": 1024 ** 4}
+
+def _parse_mem(quantity: str) -> int:
+    """Parse a memory quantity like '16335460Ki' into bytes."""
+    suffix = quantity[-2:]
+    if suffix in _MEM_MULT:
+        return int(quantity[:-2]) * _MEM_MULT[suffix]
+    return int(quantity)
+
+def _parse_cpu(quantity: str) -> float:
+    """Parse a CPU quantity like '4' or '3500m' into cores."""
+    if quantity.endswith("m"):
+        return int(quantity[:-1]) / 1000
+    return int(quantity)
+
+def _restart_count(pod) -> int:
+    """Total container restarts for a V1Pod."""
+    restarts = 0
+    container_statuses = pod.status.container_statuses
+    if container_statuses:
+        for status in container_statuses:
+            restarts += status.restart_count
+    return restarts
+
+def ttl_cache(seconds: float):
+    """Cache a method's result per instance and arguments for `seconds`.
+    
+    Results live on the instance, so they are freed with it. Nothing is stored
+    when the method raises.
+    """
+    def decorator(func):
+        attr = f"_ttl_cache_{func.__name__}"
+        
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            cache = self.__dict__.setdefault(attr, {})
+            key = (args, tuple(sorted(kwargs.items())))
+            now = time.monotonic()
+            cached = cache.get(key)
+            if cached is not None and cached[1] > now:
+                return cached[0]
+            value = func(self, *args, **kwargs)
+            cache[key] = (value, now + seconds)
+            return value
+        
+        return wrapper
+    return decorator
+
 class KubernetesToolbox:
     """
     A toolbox for interacting with the Kubernetes API.
@@ -17,6 +79,7 @@ class KubernetesToolbox:
         self._load_config()
         self.core_v1 = client.CoreV1Api()
         self.apps_v1 = client.AppsV1Api()
+        self._version_api = client.VersionApi()
         
     def _load_config(self):
         """Load Kubernetes configuration."""
@@ -33,21 +96,22 @@ class KubernetesToolbox:
                 logger.error("Could not load Kubernetes configuration")
                 raise
 
-    def list_pods(self, namespace: str = "default") -> List[Dict[str, Any]]:
-        """List pods in a namespace."""
+    def list_pods(self, namespace: str = "default", node_name: str | None = None) -> List[Dict[str, Any]]:
+        """List pods in a namespace, optionally only those scheduled on node_name."""
         try:
-            pods = self.core_v1.list_namespaced_pod(namespace)
-            result = []
-            for pod in pods.items:
-                result.append({
+            field_selector = f"spec.nodeName={node_name}" if node_name else None
+            pods = self.core_v1.list_namespaced_pod(namespace, field_selector=field_selector)
+            return [
+                {
                     "name": pod.metadata.name,
                     "namespace": pod.metadata.namespace,
                     "status": pod.status.phase,
                     "node": pod.spec.node_name,
                     "ip": pod.status.pod_ip,
-                    "restarts": sum(c.restart_count for c in pod.status.container_statuses) if pod.status.container_statuses else 0
-                })
-            return result
+                    "restarts": _restart_count(pod)
+                }
+                for pod in pods.items
+            ]
         except ApiException as e:
             logger.error(f"Failed to list pods: {e}")
             return []
@@ -86,13 +150,12 @@ class KubernetesToolbox:
                     "template": {
                         "metadata": {
                             "annotations": {
-                                "kubectl.kubernetes.io/restartedAt": f"{datetime.utcnow().isoformat()}Z"
+                                "kubectl.kubernetes.io/restartedAt": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
                             }
                         }
                     }
                 }
             }
-            from datetime import datetime
             
             self.apps_v1.patch_namespaced_deployment(
                 name=deployment_name,
@@ -120,53 +183,67 @@ class KubernetesToolbox:
             logger.error(f"Failed to scale {name}: {e}")
             return {"status": "error", "message": str(e)}
 
+    def _fetch_nodes(self) -> List[Dict[str, Any]]:
+        """List all nodes in the cluster; raises on API errors."""
+        nodes = self.core_v1.list_node()
+        result = []
+        for node in nodes.items:
+            # Check node conditions for Ready status
+            ready = False
+            for condition in node.status.conditions or []:
+                if condition.type == "Ready":
+                    ready = condition.status == "True"
+                    break
+            
+            # Get allocatable resources
+            allocatable = node.status.allocatable or {}
+            capacity = node.status.capacity or {}
+            
+            result.append({
+                "name": node.metadata.name,
+                "ready": ready,
+                "cpu_capacity": capacity.get("cpu", "0"),
+                "memory_capacity": capacity.get("memory", "0"),
+                "cpu_allocatable": allocatable.get("cpu", "0"),
+                "memory_allocatable": allocatable.get("memory", "0"),
+            })
+        return result
+
     def list_nodes(self) -> List[Dict[str, Any]]:
         """List all nodes in the cluster."""
         try:
-            nodes = self.core_v1.list_node()
-            result = []
-            for node in nodes.items:
-                # Check node conditions for Ready status
-                ready = False
-                for condition in node.status.conditions or []:
-                    if condition.type == "Ready":
-                        ready = condition.status == "True"
-                        break
-                
-                # Get allocatable resources
-                allocatable = node.status.allocatable or {}
-                capacity = node.status.capacity or {}
-                
-                result.append({
-                    "name": node.metadata.name,
-                    "ready": ready,
-                    "cpu_capacity": capacity.get("cpu", "0"),
-                    "memory_capacity": capacity.get("memory", "0"),
-                    "cpu_allocatable": allocatable.get("cpu", "0"),
-                    "memory_allocatable": allocatable.get("memory", "0"),
-                })
-            return result
+            return self._fetch_nodes()
         except ApiException as e:
             logger.error(f"Failed to list nodes: {e}")
             return []
 
-    def get_cluster_metrics(self) -> Dict[str, Any]:
-        """Get cluster-wide metrics (CPU, memory, pods, nodes)."""
-        try:
-            # Get nodes
-            nodes = self.list_nodes()
-            nodes_ready = sum(1 for n in nodes if n.get("ready"))
-            nodes_total = len(nodes)
-            
-            # Get all pods
-            pods = self.core_v1.list_pod_for_all_namespaces()
-            pods_running = 0
-            pods_pending = 0
-            pods_failed = 0
-            pods_total = len(pods.items)
+    @ttl_cache(K8S_CACHE_TTL_SECONDS)
+    def _fetch_cluster_metrics(self) -> Dict[str, Any]:
+        """Compute cluster-wide metrics; raises on API errors so failures are never cached."""
+        # Get nodes
+        nodes = self._fetch_nodes()
+        nodes_ready = sum(1 for n in nodes if n.get("ready"))
+        nodes_total = len(nodes)
+        
+        # Count pod phases page by page from the raw JSON; only status.phase
+        # is needed, so skip deserializing full V1Pod models
+        pods_running = 0
+        pods_pending = 0
+        pods_failed = 0
+        pods_total = 0
+        
+        continue_token = None
+        while True:
+            response = self.core_v1.list_pod_for_all_namespaces(
+                limit=LIST_PAGE_SIZE,
+                _continue=continue_token,
+                _preload_content=False
+            )
+            page = orjson.loads(response.data)
             
-            for pod in pods.items:
-                phase = pod.status.phase
+            for pod in page.get("items", []):
+                phase = pod.get("status", {}).get("phase")
+                pods_total += 1
                 if phase == "Running":
                     pods_running += 1
                 elif phase == "Pending":
@@ -174,59 +251,54 @@ class KubernetesToolbox:
                 elif phase in ("Failed", "Unknown"):
                     pods_failed += 1
             
-            # Calculate approximate CPU/memory (simplified)
-            # Real implementation would use metrics-server
-            total_cpu_capacity = 0
-            total_memory_capacity = 0
-            
-            for node in nodes:
-                cpu_str = node.get("cpu_capacity", "0")
-                mem_str = node.get("memory_capacity", "0")
-                
-                # Parse CPU (cores or millicores)
-                if cpu_str.endswith("m"):
-                    total_cpu_capacity += int(cpu_str[:-1]) / 1000
-                else:
-                    try:
-                        total_cpu_capacity += int(cpu_str)
-                    except:
-                        pass
-                
-                # Parse memory (Ki, Mi, Gi)
-                try:
-                    if mem_str.endswith("Ki"):
-                        total_memory_capacity += int(mem_str[:-2]) * 1024
-                    elif mem_str.endswith("Mi"):
-                        total_memory_capacity += int(mem_str[:-2]) * 1024 * 1024
-                    elif mem_str.endswith("Gi"):
-                        total_memory_capacity += int(mem_str[:-2]) * 1024 * 1024 * 1024
-                except:
-                    pass
-            
-            # Estimate usage (placeholder - real values need metrics-server)
-            cpu_usage_estimate = total_cpu_capacity * 0.3  # 30% estimate
-            memory_usage_estimate = total_memory_capacity * 0.4  # 40% estimate
-            
-            return {
-                "cpu": {
-                    "usage": round(cpu_usage_estimate, 2),
-                    "capacity": round(total_cpu_capacity, 2)
-                },
-                "memory": {
-                    "usage": int(memory_usage_estimate),
-                    "capacity": int(total_memory_capacity)
-                },
-                "pods": {
-                    "running": pods_running,
-                    "pending": pods_pending,
-                    "failed": pods_failed,
-                    "total": pods_total
-                },
-                "nodes": {
-                    "ready": nodes_ready,
-                    "total": nodes_total
-                }
+            continue_token = page.get("metadata", {}).get("continue")
+            if not continue_token:
+                break
+        
+        # Calculate approximate CPU/memory (simplified)
+        # Real implementation would use metrics-server
+        total_cpu_capacity = 0
+        total_memory_capacity = 0
+        
+        for node in nodes:
+            try:
+                total_cpu_capacity += _parse_cpu(node.get("cpu_capacity", "0"))
+            except (ValueError, KeyError):
+                pass
+            try:
+                total_memory_capacity += _parse_mem(node.get("memory_capacity", "0"))
+            except (ValueError, KeyError):
+                pass
+        
+        # Estimate usage (placeholder - real values need metrics-server)
+        cpu_usage_estimate = total_cpu_capacity * 0.3  # 30% estimate
+        memory_usage_estimate = total_memory_capacity * 0.4  # 40% estimate
+        
+        return {
+            "cpu": {
+                "usage": round(cpu_usage_estimate, 2),
+                "capacity": round(total_cpu_capacity, 2)
+            },
+            "memory": {
+                "usage": int(memory_usage_estimate),
+                "capacity": int(total_memory_capacity)
+            },
+            "pods": {
+                "running": pods_running,
+                "pending": pods_pending,
+                "failed": pods_failed,
+                "total": pods_total
+            },
+            "nodes": {
+                "ready": nodes_ready,
+                "total": nodes_total
             }
+        }
+
+    def get_cluster_metrics(self) -> Dict[str, Any]:
+        """Get cluster-wide metrics (CPU, memory, pods, nodes)."""
+        try:
+            return self._fetch_cluster_metrics()
         except ApiException as e:
             logger.error(f"Failed to get cluster metrics: {e}")
             return {
@@ -246,40 +318,64 @@ class KubernetesToolbox:
             
             result = []
             for event in events.items:
-                result.append({
-                    "timestamp": event.last_timestamp.isoformat() if event.last_timestamp else event.metadata.creation_timestamp.isoformat() if event.metadata.creation_timestamp else "",
+                event_time = event.last_timestamp or event.metadata.creation_timestamp
+                result.append((event_time.timestamp() if event_time else 0.0, {
+                    "timestamp": event_time.isoformat() if event_time else "",
                     "type": event.type or "Normal",
                     "reason": event.reason or "",
                     "message": event.message or "",
                     "object": f"{event.involved_object.kind}/{event.involved_object.name}" if event.involved_object else "",
                     "namespace": event.metadata.namespace or "",
                     "count": event.count or 1
-                })
+                }))
             
-            # Sort by timestamp descending
-            result.sort(key=lambda x: x["timestamp"], reverse=True)
-            return result[:limit]
+            # Newest first: bounded heap over epoch seconds instead of sorting ISO strings
+            return [entry for _, entry in heapq.nlargest(limit, result, key=itemgetter(0))]
         except ApiException as e:
             logger.error(f"Failed to list events: {e}")
             return []
 
+    @ttl_cache(K8S_CACHE_TTL_SECONDS)
+    def count_namespaces(self) -> int:
+        """Count namespaces in the cluster."""
+        return len(self.core_v1.list_namespace().items)
+
+    @ttl_cache(VERSION_CACHE_TTL_SECONDS)
+    def _fetch_version_info(self) -> Dict[str, str]:
+        """Fetch the cluster version; raises on failure so errors are never cached."""
+        version = self._version_api.get_code()
+        return {
+            "version": version.git_version,
+            "platform": version.platform
+        }
+
     def get_version_info(self) -> Dict[str, str]:
         """Get Kubernetes cluster version."""
         try:
-            version_api = client.VersionApi()
-            version = version_api.get_code()
-            return {
-                "version": version.git_version,
-                "platform": version.platform
-            }
+            return self._fetch_version_info()
         except Exception as e:
             logger.error(f"Failed to get version: {e}")
             return {"version": "unknown", "platform": "unknown"}
 
-# Global instance
-try:
-    k8s_toolbox = KubernetesToolbox()
-except Exception as e:
-    logger.warning(f"Failed to initialize Kubernetes toolbox: {e}")
-    k8s_toolbox = None
+# Global instance, created on first use so importing this module stays cheap
+_k8s_toolbox: KubernetesToolbox | None = None
+_k8s_toolbox_loaded = False
+
+def get_k8s_toolbox() -> KubernetesToolbox | None:
+    """Return the shared toolbox, or None if Kubernetes is unreachable (tried once)."""
+    global _k8s_toolbox, _k8s_toolbox_loaded
+    if not _k8s_toolbox_loaded:
+        try:
+            _k8s_toolbox = KubernetesToolbox()
+        except Exception as e:
+            logger.warning(f"Failed to initialize Kubernetes toolbox: {e}")
+            _k8s_toolbox = None
+        _k8s_toolbox_loaded = True
+    return _k8s_toolbox
+
+def __getattr__(name: str):
+    # PEP 562: keep `from ...k8s_client import k8s_toolbox` working, lazily
+    if name == "k8s_toolbox":
+        return get_k8s_toolbox()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
@@ -1,40 +1,57 @@
+import cramjam
 import requests
-import snappy
+from requests.adapters import HTTPAdapter
 import time
 from src.proto.generated import remote_pb2, types_pb2
 
+# Shared keep-alive session so repeated sends reuse the TCP connection
+_session = requests.Session()
+_session.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=32))
+
+_write_request = None
+
+def _get_write_request(value: float, timestamp_ms: int):
+    """Return the cached WriteRequest with only its sample value/timestamp updated."""
+    global _write_request
+    if _write_request is None:
+        write_request = remote_pb2.WriteRequest()
+        
+        # Create a TimeSeries
+        ts = write_request.timeseries.add()
+        
+        # Add Labels
+        label = ts.labels.add()
+        label.name = "__name__"
+        label.value = "test_metric"
+        
+        label2 = ts.labels.add()
+        label2.name = "job"
+        label2.value = "verification_script"
+        
+        # Add Sample
+        ts.samples.add()
+        _write_request = write_request
+    
+    sample = _write_request.timeseries[0].samples[0]
+    sample.value = value
+    sample.timestamp = timestamp_ms
+    return _write_request
+
 def verify_ingest():
     url = "http://localhost:9091/api/v1/receive"
     
     print(f"Sending request to {url}...")
 
-    # 1. Create a WriteRequest
-    write_request = remote_pb2.WriteRequest()
-    
-    # Create a TimeSeries
-    ts = write_request.timeseries.add()
-    
-    # Add Labels
-    label = ts.labels.add()
-    label.name = "__name__"
-    label.value = "test_metric"
-    
-    label2 = ts.labels.add()
-    label2.name = "job"
-    label2.value = "verification_script"
-    
-    # Add Sample
-    sample = ts.samples.add()
-    sample.value = 123.456
-    sample.timestamp = int(time.time() * 1000) # ms timestamp
+    # 1. Create a WriteRequest (built once, then only the sample is updated)
+    write_request = _get_write_request(123.456, int(time.time() * 1000)) # ms timestamp
     
     # 2. Serialize and Compress
     serialized_data = write_request.SerializeToString()
-    compressed_data = snappy.compress(serialized_data)
+    compressed_data = bytes(cramjam.snappy.compress_raw(serialized_data))
     
     # 3. Send Request
     try:
-        response = requests.post(
+        response = _session.post(
             url, 
             data=compressed_data, 
             headers={
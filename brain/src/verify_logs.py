@@ -1,9 +1,14 @@
+import cramjam
 import requests
-import snappy
+from requests.adapters import HTTPAdapter
 import time
 from src.proto.generated import logproto_pb2
 from google.protobuf.timestamp_pb2 import Timestamp
 
+# Shared keep-alive session so repeated sends reuse the TCP connection
+_session = requests.Session()
+_session.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=32))
+
 def verify_log_ingest():
     url = "http://localhost:9091/loki/api/v1/push"
     
@@ -25,11 +30,11 @@ def verify_log_ingest():
     
     # 2. Serialize and Compress
     serialized_data = push_request.SerializeToString()
-    compressed_data = snappy.compress(serialized_data)
+    compressed_data = bytes(cramjam.snappy.compress_raw(serialized_data))
     
     # 3. Send Request
     try:
-        response = requests.post(
+        response = _session.post(
             url, 
             data=compressed_data, 
             headers={
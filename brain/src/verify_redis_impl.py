@@ -1,51 +1,61 @@
+import asyncio
 import sys
 import threading
 import time
-import json
 import logging
-import queue
-from unittest.mock import MagicMock, patch
 
-# Mock redis before importing server
-import fakeredis
-sys.modules['redis'] = MagicMock()
-sys.modules['redis'].Redis = fakeredis.FakeRedis
-
-# Now import server components
 from src.database import Database
-from src.server import redis_client, QUEUE_KEY, data_processor, cleanup_loop
+
+# One shared handle for every verifier
+db = Database()
+
+def _server():
+    """Import the ingest queue and its processor lazily; importing the server is slow."""
+    from src.server import data_queue, data_processor
+    return data_queue, data_processor
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("validation")
 
-def verify_redis_queue():
-    print("--- Verifying Redis Queue ---")
-    
-    # Start the processor in a thread
+async def _poll_until(predicate, timeout: float = 2.0, interval: float = 0.05):
+    """Re-run a blocking predicate off the event loop until it is truthy or timeout expires."""
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while True:
+        result = await asyncio.to_thread(predicate)
+        if result or loop.time() >= deadline:
+            return result
+        await asyncio.sleep(interval)
+
+def start_processor():
+    """Start the queue processor thread shared by the verifiers."""
+    _, data_processor = _server()
     processor_thread = threading.Thread(target=data_processor, daemon=True)
     processor_thread.start()
+
+async def verify_ingest_queue():
+    print("--- Verifying Ingest Queue ---")
+    data_queue, _ = _server()
     
-    # Push a metric to Redis
+    # Queue a metric the way the ingest endpoints do
     test_metric = {
         'type': 'metric',
         'timestamp': int(time.time() * 1000),
-        'name': 'redis_test_metric',
+        'name': 'ingest_test_metric',
         'labels': {'job': 'test'},
         'value': 99.9
     }
-    redis_client.rpush(QUEUE_KEY, json.dumps(test_metric))
-    print(f"Pushed metric: {test_metric['name']}")
-    
-    # Wait a bit for processing
-    time.sleep(2)
+    data_queue.put(test_metric)
+    print(f"Queued metric: {test_metric['name']}")
     
-    # Check DB
-    db = Database()
-    with db.get_connection() as conn:
-        cursor = conn.cursor()
-        cursor.execute("SELECT * FROM metrics WHERE name = 'redis_test_metric'")
-        row = cursor.fetchone()
+    # Wait for processing
+    def fetch_metric():
+        with db.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT * FROM metrics WHERE name = 'ingest_test_metric'")
+            return cursor.fetchone()
+    row = await _poll_until(fetch_metric)
         
     if row:
         print("SUCCESS: Metric found in DB.")
@@ -53,10 +63,10 @@ def verify_redis_queue():
         print("FAILURE: Metric NOT found in DB.")
         sys.exit(1)
 
-def verify_log_deduplication():
+async def verify_log_deduplication():
     print("\n--- Verifying Log Deduplication ---")
+    data_queue, _ = _server()
     
-    db = Database()
     ts = int(time.time() * 1000)
     labels = {'app': 'dedup_test'}
     line = "Duplicate log message"
@@ -71,15 +81,20 @@ def verify_log_deduplication():
             'labels': labels,
             'line': line
         }
-        redis_client.rpush(QUEUE_KEY, json.dumps(item))
+        data_queue.put(item)
         
-    print("Pushed 3 identical logs.")
-    time.sleep(2)
+    print("Queued 3 identical logs.")
     
-    with db.get_connection() as conn:
-        cursor = conn.cursor()
-        cursor.execute("SELECT count FROM logs WHERE line = ?", (line,))
-        row = cursor.fetchone()
+    def fetch_count():
+        with db.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT count FROM logs WHERE line = ?", (line,))
+            return cursor.fetchone()
+    def fetch_all_copies():
+        row = fetch_count()
+        return row if row and row[0] >= 3 else None
+    # Stop waiting as soon as all three copies have been folded in
+    row = await _poll_until(fetch_all_copies) or fetch_count()
         
     if row:
         count = row[0]
@@ -95,18 +110,17 @@ def verify_log_deduplication():
         print("FAILURE: Log not found.")
         sys.exit(1)
 
-def verify_log_retention():
+async def verify_log_retention():
     print("\n--- Verifying Log Retention ---")
-    db = Database()
     
     # Manually insert an old log
     old_ts = int((time.time() - 20 * 60) * 1000) # 20 mins ago
-    db.insert_log(old_ts, {'app': 'old'}, "Old log")
+    await asyncio.to_thread(db.insert_log, old_ts, {'app': 'old'}, "Old log")
     
     print("Inserted old log (20 mins ago).")
     
     # Trigger cleanup manually
-    db.delete_old_logs(retention_minutes=10)
+    await asyncio.to_thread(db.delete_old_logs, retention_minutes=10)
     
     with db.get_connection() as conn:
         cursor = conn.cursor()
@@ -119,8 +133,15 @@ def verify_log_retention():
          print("FAILURE: Old log still exists.")
          sys.exit(1)
 
+async def main():
+    start_processor()
+    # The verifiers touch disjoint rows, so they can wait on the processor together
+    await asyncio.gather(
+        verify_ingest_queue(),
+        verify_log_deduplication(),
+        verify_log_retention()
+    )
+
 if __name__ == "__main__":
-    verify_redis_queue()
-    verify_log_deduplication()
-    verify_log_retention()
+    asyncio.run(main())
     print("\nALL TESTS PASSED")